@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+from pathlib import Path
 from typing import Annotated
 
 import typer
@@ -10,6 +11,7 @@ from rich.console import Console
 from textual_serve.server import Server
 
 from par_infini_sweeper import __application_title__, __version__
+from par_infini_sweeper.enums import FrontierShape, GameDifficulty
 from par_infini_sweeper.pim_app import PimApp
 
 app = typer.Typer()
@@ -23,8 +25,9 @@ def version_callback(value: bool) -> None:
         raise typer.Exit()
 
 
-@app.command()
+@app.callback(invoke_without_command=True)
 def main(
+    ctx: typer.Context,
     start_server: Annotated[
         bool, typer.Option("--server", "-s", help="Start webserver that allows app to be played in a browser")
     ] = False,
@@ -36,6 +39,8 @@ def main(
     ] = None,
 ) -> None:
     """Main function."""
+    if ctx.invoked_subcommand:
+        return
 
     if user_name and len(user_name) > 20:
         console.print("User name must be 20 characters or less")
@@ -58,5 +63,75 @@ def main(
     sweeper_app.run()
 
 
+@app.command()
+def bench(
+    scenarios: Annotated[
+        list[str] | None, typer.Option("--scenario", "-k", help="Scenario to run, can be repeated. Default all")
+    ] = None,
+    output: Annotated[Path | None, typer.Option("--output", "-o", help="Write results as JSON to this file")] = None,
+    baseline: Annotated[
+        Path | None, typer.Option("--baseline", "-b", help="JSON results of a previous run to compare against")
+    ] = None,
+    threshold: Annotated[
+        float, typer.Option("--threshold", "-t", help="Fraction a metric may get worse by before failing")
+    ] = 0.2,
+    seed: Annotated[int, typer.Option("--seed", help="Seed for boards and moves")] = 0,
+) -> None:
+    """Run benchmarks of the engine, rendering and storage."""
+    from par_infini_sweeper import bench as benchmarks
+
+    try:
+        results: dict[str, dict[str, float]] = benchmarks.run_benchmarks(scenarios, seed)
+    except ValueError as e:
+        console.print(str(e))
+        raise typer.Exit(1)
+    for scenario, metrics in results.items():
+        for name, value in metrics.items():
+            print(f"{scenario}.{name}: {value:,.6f}" if isinstance(value, float) else f"{scenario}.{name}: {value:,}")
+    if output:
+        benchmarks.write_results(output, results, seed)
+    if baseline:
+        regressions: list[str] = benchmarks.compare_results(results, benchmarks.read_results(baseline), threshold)
+        for regression in regressions:
+            console.print(f"[red]Regression[/] {regression}")
+        if regressions:
+            raise typer.Exit(1)
+
+
+@app.command()
+def generate(
+    user_name: Annotated[str, typer.Option("--user", "-u", help="User whose saved game is replaced")] = "synthetic",
+    num_subgrids: Annotated[int, typer.Option("--subgrids", "-c", help="Number of saved subgrids")] = 100_000,
+    solved_ratio: Annotated[
+        float, typer.Option("--solved-ratio", "-r", help="Fraction of subgrids away from the edge that are solved")
+    ] = 0.9,
+    shape: Annotated[FrontierShape, typer.Option("--shape", help="Shape of the played area")] = FrontierShape.BLOB,
+    difficulty: Annotated[GameDifficulty, typer.Option("--difficulty", "-d", help="Game difficulty")] = (
+        GameDifficulty.EASY
+    ),
+    num_highscores: Annotated[int, typer.Option("--highscores", help="Number of highscores to add")] = 100,
+    seed: Annotated[int, typer.Option("--seed", help="Seed for the generated game")] = 0,
+    db_folder: Annotated[
+        Path | None, typer.Option("--db", help="Folder of the database to write to. Default the game database")
+    ] = None,
+) -> None:
+    """Write a large synthetic game to the database for load and stress testing."""
+    from par_infini_sweeper import db
+    from par_infini_sweeper.board_generator import generate_board
+
+    if len(user_name) > 20:
+        console.print("User name must be 20 characters or less")
+        raise typer.Exit(1)
+    if db_folder:
+        db.set_db_folder(db_folder)
+    stats = generate_board(
+        db.get_db_connection(), user_name, num_subgrids, solved_ratio, shape, difficulty, seed, num_highscores
+    )
+    db.close_db_connection()
+    for name, value in stats.items():
+        print(f"{name}: {value:,.6f}" if isinstance(value, float) else f"{name}: {value:,}")
+    print(f"Play it with: pim --user {user_name}")
+
+
 if __name__ == "__main__":
     main_app = app()
@@ -0,0 +1,110 @@
+"""Online backups of the game database."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from par_infini_sweeper import db
+
+# Seconds between backups
+BACKUP_INTERVAL: int = 86400
+# Number of backups to keep, the newest is game_data.sqlite.bak and older ones get a .1, .2... suffix
+BACKUP_GENERATIONS: int = 3
+# Pages copied per step, with a short sleep between steps so the game can keep writing
+BACKUP_PAGES: int = 64
+BACKUP_SLEEP: float = 0.01
+
+
+def backup_path(generation: int = 0) -> Path:
+    """
+    Return the path of a backup generation.
+
+    Args:
+        generation (int): 0 for the newest backup.
+
+    Returns:
+        Path: Backup file path.
+    """
+    return db.db_bak_path if generation == 0 else db.db_bak_path.with_name(f"{db.db_bak_path.name}.{generation}")
+
+
+def backup_due(interval: int = BACKUP_INTERVAL) -> bool:
+    """
+    Return True if the database exists and the newest backup is missing or older than interval seconds.
+
+    Args:
+        interval (int): Maximum age in seconds of the newest backup.
+    """
+    if not db.db_path.exists():
+        return False
+    newest: Path = backup_path()
+    return not newest.exists() or newest.stat().st_mtime < time.time() - interval
+
+
+def _rotate(new_backup: Path, generations: int) -> None:
+    oldest: Path = backup_path(generations - 1)
+    if generations > 1 and oldest.exists():
+        oldest.unlink()
+    for generation in range(generations - 2, -1, -1):
+        if backup_path(generation).exists():
+            os.replace(backup_path(generation), backup_path(generation + 1))
+    os.replace(new_backup, backup_path())
+
+
+def backup_db(generations: int = BACKUP_GENERATIONS) -> bool:
+    """
+    Copy the database to a new backup a few pages at a time, verify it and rotate older generations.
+    The copy is consistent even if the game writes while it runs. A copy that fails its integrity check is discarded.
+
+    Args:
+        generations (int): Number of backups to keep.
+
+    Returns:
+        bool: True if a verified backup was written.
+    """
+    tmp_path: Path = db.db_bak_path.with_name(f"{db.db_bak_path.name}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    source: sqlite3.Connection = db.open_db_connection()
+    target: sqlite3.Connection = sqlite3.connect(tmp_path)
+    try:
+        source.backup(target, pages=BACKUP_PAGES, sleep=BACKUP_SLEEP)
+        # Keep the backup a single self-contained file.
+        target.execute("PRAGMA journal_mode = DELETE")
+        ok: bool = target.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    except sqlite3.Error:
+        ok = False
+    finally:
+        target.close()
+        source.close()
+    if not ok:
+        tmp_path.unlink(missing_ok=True)
+        return False
+    _rotate(tmp_path, max(1, generations))
+    return True
+
+
+class BackupThread(threading.Thread):
+    """Daemon thread that backs up the database whenever the newest backup is older than the interval."""
+
+    def __init__(
+        self, interval: int = BACKUP_INTERVAL, generations: int = BACKUP_GENERATIONS, poll_interval: float = 600
+    ) -> None:
+        super().__init__(name="pim-backup", daemon=True)
+        self.interval: int = interval
+        self.generations: int = generations
+        self.poll_interval: float = poll_interval
+        self._stop_event: threading.Event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            if backup_due(self.interval):
+                backup_db(self.generations)
+            self._stop_event.wait(min(self.poll_interval, self.interval))
+
+    def stop(self) -> None:
+        """Ask the thread to exit after any backup in progress completes."""
+        self._stop_event.set()
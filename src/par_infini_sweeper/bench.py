@@ -0,0 +1,619 @@
+"""Micro benchmarks for Par Infinite Minesweeper hot paths."""
+
+from __future__ import annotations
+
+import asyncio
+import platform
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, cast
+
+import orjson
+from rich.text import Text
+from textual.geometry import Offset
+from textual.widget import Widget
+
+from par_infini_sweeper import db
+from par_infini_sweeper.board_generator import generate_board
+from par_infini_sweeper.data_structures import GameState
+from par_infini_sweeper.engine import (
+    Board,
+    GridPos,
+    RevealResult,
+    SubGrid,
+    cell_index,
+    new_seed,
+)
+from par_infini_sweeper.enums import GameDifficulty, ZoomLevel
+from par_infini_sweeper.main_grid import MainGrid
+
+
+def make_user(difficulty: GameDifficulty = GameDifficulty.EASY) -> dict[str, Any]:
+    """Return a minimal user record suitable for constructing a detached GameState."""
+    return {
+        "id": 0,
+        "nickname": "bench",
+        "access_token": "",
+        "refresh_token": "",
+        "prefs": {"theme": "textual-dark", "difficulty": difficulty},
+        "game": {"id": 0, "board_offset": "0,0", "duration": 0, "game_over": False, "seed": 0, "snapshot_seq": 0},
+    }
+
+
+def square_positions(num_subgrids: int) -> list[GridPos]:
+    """Return num_subgrids subgrid positions filling a square around the origin."""
+    side: int = max(1, int(num_subgrids**0.5))
+    return [(i % side - side // 2, i // side - side // 2) for i in range(num_subgrids)]
+
+
+def timed(func: Callable[[], Any], repeat: int = 3) -> float:
+    """Return the best wall time in seconds of `repeat` calls to func."""
+    best: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class _LegacyCell:
+    """Replica of the object-per-cell layout that SubGrid used before bitboards, kept for comparison."""
+
+    def __init__(self, parent: Any, is_mine: bool) -> None:
+        self._parent = parent
+        self._is_mine: bool = is_mine
+        self._marked: bool = False
+        self._uncovered: bool = False
+        self._changed: bool = False
+        self._highlighted: bool = False
+
+
+def _legacy_board(positions: list[GridPos], state: GameState) -> dict[GridPos, list[list[_LegacyCell]]]:
+    board: dict[GridPos, list[list[_LegacyCell]]] = {}
+    for pos in positions:
+        mines: int = state.subgrids[pos].mines
+        board[pos] = [[_LegacyCell(board, bool(mines >> cell_index(x, y) & 1)) for x in range(8)] for y in range(8)]
+    return board
+
+
+def _legacy_count_all(board: dict[GridPos, list[list[_LegacyCell]]]) -> int:
+    total: int = 0
+    for (sx, sy), cells in board.items():
+        for y in range(8):
+            for x in range(8):
+                gx: int = sx * 8 + x
+                gy: int = sy * 8 + y
+                for dx in [-1, 0, 1]:
+                    for dy in [-1, 0, 1]:
+                        if dx == 0 and dy == 0:
+                            continue
+                        nx: int = gx + dx
+                        ny: int = gy + dy
+                        n_sg: GridPos = (nx // 8, ny // 8)
+                        if n_sg not in board:
+                            continue
+                        if board[n_sg][ny % 8][nx % 8]._is_mine:
+                            total += 1
+    return total
+
+
+def _bitboard_count_all(state: GameState) -> int:
+    total: int = 0
+    for sx, sy in state.subgrids:
+        for y in range(8):
+            for x in range(8):
+                total += state.count_adjacent_mines(sx * 8 + x, sy * 8 + y)
+    return total
+
+
+def _cached_count_all(state: GameState) -> int:
+    return sum(sum(subgrid.counts) for subgrid in state.subgrids.values())
+
+
+def bench_subgrid_storage(num_subgrids: int = 10_000, seed: int = 0) -> dict[str, float]:
+    """
+    Compare memory use and neighbor counting speed of bitboard subgrids against the legacy cell layout.
+
+    Args:
+        num_subgrids (int): Number of subgrids to build.
+        seed (int): Seed for mine placement.
+
+    Returns:
+        dict[str, float]: Measurements keyed by name.
+    """
+    random.seed(seed)
+    positions: list[GridPos] = square_positions(num_subgrids)
+
+    tracemalloc.start()
+    state: GameState = GameState(None, make_user())
+    for pos in positions:
+        if pos not in state.subgrids:
+            state.insert_subgrid(SubGrid(state, pos, state.difficulty))
+    bitboard_bytes: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    legacy: dict[GridPos, list[list[_LegacyCell]]] = _legacy_board(positions, state)
+    legacy_bytes: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Count on a smaller board so the legacy layout finishes in reasonable time.
+    count_positions: list[GridPos] = square_positions(min(num_subgrids, 1000))
+    legacy_subset = {pos: legacy[pos] for pos in count_positions}
+    bitboard_subset: GameState = GameState(None, make_user())
+    bitboard_subset.subgrids = {}
+    for pos in count_positions:
+        subgrid: SubGrid = SubGrid(bitboard_subset, pos)
+        subgrid.mines = state.subgrids[pos].mines
+        subgrid.recount()
+        bitboard_subset.insert_subgrid(subgrid)
+    assert _legacy_count_all(legacy_subset) == _bitboard_count_all(bitboard_subset)
+
+    return {
+        "num_subgrids": num_subgrids,
+        "bitboard_bytes_per_subgrid": bitboard_bytes / num_subgrids,
+        "legacy_bytes_per_subgrid": legacy_bytes / num_subgrids,
+        "bitboard_count_sec": timed(lambda: _bitboard_count_all(bitboard_subset)),
+        "cached_count_sec": timed(lambda: _cached_count_all(bitboard_subset)),
+        "legacy_count_sec": timed(lambda: _legacy_count_all(legacy_subset)),
+    }
+
+
+class _HeadlessParent:
+    """Stand-in for MainGrid when driving a GameState without a UI."""
+
+    app = None
+
+    def notify(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def refresh(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+@contextmanager
+def temp_database() -> Iterator[Path]:
+    """Point the db module at an empty database in a temporary folder for the duration of the block."""
+    saved: Path = db.db_folder
+    with tempfile.TemporaryDirectory() as folder:
+        db.set_db_folder(Path(folder))
+        try:
+            yield db.db_path
+        finally:
+            db.set_db_folder(saved)
+
+
+def _legacy_get_db_connection() -> sqlite3.Connection:
+    """Replica of get_db_connection before connections were persistent, kept for comparison."""
+    if db.db_path.exists():
+        if not db.db_bak_path.exists():
+            db.db_bak_path.write_bytes(db.db_path.read_bytes())
+        elif db.db_bak_path.stat().st_mtime < (db.db_path.stat().st_mtime - 86400):
+            db.db_bak_path.write_bytes(db.db_path.read_bytes())
+    conn = sqlite3.connect(db.db_path, timeout=5)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def next_click(state: Board, rng: random.Random, positions: list[GridPos] | None = None) -> GridPos:
+    """Return a random covered safe cell that the player is allowed to reveal, in one of positions if given."""
+    positions = positions or sorted(state.subgrids)
+    while True:
+        sx, sy = rng.choice(positions)
+        gx: int = sx * 8 + rng.randrange(8)
+        gy: int = sy * 8 + rng.randrange(8)
+        subgrid: SubGrid = state.subgrids[(sx, sy)]
+        bit: int = 1 << cell_index(gx & 7, gy & 7)
+        if (subgrid.mines | subgrid.marked | subgrid.uncovered) & bit:
+            continue
+        if state.first_click or state.cell_has_uncovered_neighbor(gx, gy):
+            return gx, gy
+
+
+def _click_save_latencies(num_clicks: int, seed: int) -> list[float]:
+    random.seed(seed)
+    db.init_db(db.get_db_connection(), "bench")
+    state: GameState = GameState.load(cast(Widget, _HeadlessParent()), "bench", lazy=False)
+    rng: random.Random = random.Random(seed)
+    latencies: list[float] = []
+    for _ in range(num_clicks):
+        gx, gy = next_click(state, rng)
+        start: float = time.perf_counter()
+        state.reveal(gx, gy)
+        state.save()
+        state.flush()
+        latencies.append(time.perf_counter() - start)
+    state.close()
+    return latencies
+
+
+def bench_click_save(num_clicks: int = 200, seed: int = 0) -> dict[str, float]:
+    """
+    Measure the latency from revealing a cell until the game is saved, with persistent and per-call connections.
+
+    Args:
+        num_clicks (int): Number of clicks to time.
+        seed (int): Seed for the game and click positions.
+
+    Returns:
+        dict[str, float]: Median and 95th percentile latencies in milliseconds keyed by name.
+    """
+    results: dict[str, float] = {"num_clicks": num_clicks}
+    persistent_get_db_connection: Callable[[], sqlite3.Connection] = db.get_db_connection
+    for name, get_connection in (("legacy", _legacy_get_db_connection), ("persistent", persistent_get_db_connection)):
+        with temp_database():
+            db.get_db_connection = get_connection
+            try:
+                latencies: list[float] = _click_save_latencies(num_clicks, seed)
+            finally:
+                db.get_db_connection = persistent_get_db_connection
+        latencies.sort()
+        results[f"{name}_median_ms"] = statistics.median(latencies) * 1000
+        results[f"{name}_p95_ms"] = latencies[int(len(latencies) * 0.95)] * 1000
+    return results
+
+
+def bench_engine_moves(num_moves: int = 100_000, seed: int = 0) -> dict[str, float]:
+    """
+    Measure how many moves per second the headless engine plays, starting a new board whenever a game ends.
+    Moves are 80% reveals of safe cells, 15% marks and 5% chords. Only the engine calls are timed.
+
+    Args:
+        num_moves (int): Number of moves to play.
+        seed (int): Seed for the boards and moves.
+
+    Returns:
+        dict[str, float]: Measurements keyed by name.
+    """
+    random.seed(seed)
+    rng: random.Random = random.Random(seed)
+    board: Board = Board(new_seed(), GameDifficulty.EASY)
+    num_games: int = 1
+    cells_revealed: int = 0
+    positions: list[GridPos] = []
+    elapsed: float = 0
+    for _ in range(num_moves):
+        if board.game_over or board.num_uncovered > 20_000:
+            board.reset(new_seed())
+            num_games += 1
+        if len(positions) != len(board.subgrids):
+            positions = list(board.subgrids)
+        gx, gy = next_click(board, rng, positions)
+        roll: float = rng.random()
+        start: float = time.perf_counter()
+        if roll < 0.8:
+            cells_revealed += board.reveal(gx, gy).num_revealed
+        elif roll < 0.95:
+            board.mark(gx, gy)
+        else:
+            cells_revealed += board.chord(gx + 1, gy).num_revealed
+        elapsed += time.perf_counter() - start
+    return {
+        "num_moves": num_moves,
+        "num_games": num_games,
+        "cells_revealed": cells_revealed,
+        "moves_per_sec": num_moves / elapsed,
+    }
+
+
+def bench_flood_fill(side: int = 32, seed: int = 0) -> dict[str, float]:
+    """
+    Time a single reveal that flood fills a square region of side x side subgrids with no mines.
+
+    Args:
+        side (int): Width and height of the empty region in subgrids.
+        seed (int): Seed for the mine layout around the region.
+
+    Returns:
+        dict[str, float]: Measurements keyed by name.
+    """
+    board: Board = Board(seed, GameDifficulty.EASY)
+    for pos in square_positions(side * side):
+        subgrid: SubGrid = SubGrid(board, pos)
+        if pos in board.subgrids:
+            board.remove_subgrid(board.subgrids[pos])
+        board.insert_subgrid(subgrid)
+    board.first_click = False
+    start: float = time.perf_counter()
+    result: RevealResult = board.reveal(0, 0)
+    elapsed: float = time.perf_counter() - start
+    return {
+        "num_subgrids": side * side,
+        "cells_revealed": result.num_revealed,
+        "flood_fill_ms": elapsed * 1000,
+        "cells_per_sec": result.num_revealed / elapsed,
+    }
+
+
+def play_moves(state: Board, num_moves: int, rng: random.Random) -> None:
+    """Reveal num_moves random safe cells on the board, skipping moves that are blocked."""
+    positions: list[GridPos] = []
+    for _ in range(num_moves):
+        if len(positions) != len(state.subgrids):
+            positions = list(state.subgrids)
+        state.reveal(*next_click(state, rng, positions))
+
+
+def _markup_frame(widget: MainGrid) -> Text:
+    """Render the visible grid the way MainGrid did before it used the line API, for comparison."""
+    state: GameState = widget.game_state
+    lines: list[str] = [
+        "".join(
+            state.get_cell_representation(col + state.offset.x, row + state.offset.y)
+            for col in range(widget.size.width // 2)
+        )
+        for row in range(widget.size.height)
+    ]
+    return Text.from_markup("\n".join(lines))
+
+
+def _time_frame(widget: MainGrid) -> float:
+    """Return the seconds taken to render every line of the widget."""
+    start: float = time.perf_counter()
+    for y in range(widget.size.height):
+        widget.render_line(y)
+    return time.perf_counter() - start
+
+
+async def _render_times(
+    size: tuple[int, int], num_frames: int, seed: int
+) -> tuple[dict[str, float], dict[str, list[float]]]:
+    from par_infini_sweeper.pim_app import PimApp
+
+    random.seed(seed)
+    app: PimApp = PimApp("bench")
+    play_moves(app.game_state, 300, random.Random(seed))
+    times: dict[str, list[float]] = {"cold_frame": [], "frame": [], "pan_frame": [], "markup_frame": []}
+    zoom_levels: list[ZoomLevel] = [ZoomLevel.CELL, ZoomLevel.SUBGRID, ZoomLevel.BLOCK]
+    times.update({f"{zoom}_zoom_frame": [] for zoom in zoom_levels})
+    async with app.run_test(size=size) as pilot:
+        await pilot.pause()
+        widget: MainGrid = app.sweeper_widget
+        widget.action_center()
+        for frame in range(num_frames):
+            widget.row_cache.clear()
+            widget.frame_rows.clear()
+            times["cold_frame"].append(_time_frame(widget))
+            times["frame"].append(_time_frame(widget))
+            # Drag the view a few cells, alternating direction so the board under it stays the same
+            step: int = 3 if frame % 2 else -3
+            app.game_state.offset += Offset(step, step // 3)
+            times["pan_frame"].append(_time_frame(widget))
+            start: float = time.perf_counter()
+            _markup_frame(widget)
+            times["markup_frame"].append(time.perf_counter() - start)
+            for zoom in zoom_levels:
+                app.game_state.zoom = zoom
+                times[f"{zoom}_zoom_frame"].append(_time_frame(widget))
+            app.game_state.zoom = ZoomLevel.NORMAL
+        counts: dict[str, float] = {
+            "cells": widget.size.width // 2 * widget.size.height,
+            "segments": sum(len(widget.render_line(y)) for y in range(widget.size.height)),
+        }
+    return counts, times
+
+
+def bench_render(
+    sizes: tuple[tuple[int, int], ...] = ((80, 24), (160, 50), (300, 100)), num_frames: int = 20, seed: int = 0
+) -> dict[str, float]:
+    """
+    Time full MainGrid frames, every line through render_line, on a played board at several terminal sizes.
+    Frames are timed with empty render caches (cold), again once they are filled and after panning the view
+    a few cells. The markup based render MainGrid used before is timed alongside for comparison, as are the
+    first frames after switching to each zoomed out level.
+
+    Args:
+        sizes (tuple[tuple[int, int], ...]): Terminal width and height to render at.
+        num_frames (int): Number of frames to time at each size.
+        seed (int): Seed for the game and moves.
+
+    Returns:
+        dict[str, float]: Median frame times in milliseconds keyed by terminal size.
+    """
+    results: dict[str, float] = {}
+    for width, height in sizes:
+        with temp_database():
+            counts, times = asyncio.run(_render_times((width, height), num_frames, seed))
+        for name, value in counts.items():
+            results[f"{width}x{height}_{name}"] = value
+        for name, values in times.items():
+            results[f"{width}x{height}_{name}_ms"] = statistics.median(values) * 1000
+    return results
+
+
+def bench_save(num_dirty: tuple[int, ...] = (100, 1_000, 10_000), seed: int = 0) -> dict[str, float]:
+    """
+    Time GameState.save of a snapshot with N changed subgrids until it is committed.
+
+    Args:
+        num_dirty (tuple[int, ...]): Numbers of changed subgrids to save.
+        seed (int): Seed for the game and the cells uncovered.
+
+    Returns:
+        dict[str, float]: Measurements keyed by name.
+    """
+    results: dict[str, float] = {}
+    for num in num_dirty:
+        with temp_database():
+            random.seed(seed)
+            db.init_db(db.get_db_connection(), "bench")
+            state: GameState = GameState.load(None, "bench", lazy=False)
+            rng: random.Random = random.Random(seed)
+            for pos in square_positions(num):
+                subgrid: SubGrid = state.get_subgrid(pos) or state.add_subgrid(pos)
+                subgrid.set_uncovered(1 << rng.randrange(64) & ~subgrid.mines, True)
+                subgrid.changed = True
+            start: float = time.perf_counter()
+            state.save(snapshot=True)
+            state.flush()
+            results[f"save_{num}_ms"] = (time.perf_counter() - start) * 1000
+            state.close()
+    return results
+
+
+def bench_load(num_subgrids: tuple[int, ...] = (10_000, 100_000), seed: int = 0) -> dict[str, float]:
+    """
+    Time GameState.load of saved games with many subgrids, until the first frame can be drawn and until fully loaded.
+
+    Args:
+        num_subgrids (tuple[int, ...]): Numbers of saved subgrids to load.
+        seed (int): Seed for the game and the saved cells.
+
+    Returns:
+        dict[str, float]: Measurements keyed by name.
+    """
+    results: dict[str, float] = {}
+    for num in num_subgrids:
+        with temp_database():
+            random.seed(seed)
+            generate_board(db.get_db_connection(), "bench", num, seed=seed)
+            start: float = time.perf_counter()
+            state: GameState = GameState.load(None, "bench")
+            results[f"load_{num}_first_frame_ms"] = (time.perf_counter() - start) * 1000
+            state.finish_loading()
+            results[f"load_{num}_full_ms"] = (time.perf_counter() - start) * 1000
+            state.close()
+            start = time.perf_counter()
+            state = GameState.load(None, "bench", lazy=False)
+            results[f"load_{num}_eager_ms"] = (time.perf_counter() - start) * 1000
+            state.close()
+    return results
+
+
+def bench_highscores(num_scores: int = 100_000, num_users: int = 100, seed: int = 0) -> dict[str, float]:
+    """
+    Time db.get_highscores with a large highscores table.
+
+    Args:
+        num_scores (int): Number of highscore rows.
+        num_users (int): Number of users the scores are spread over.
+        seed (int): Seed for the scores.
+
+    Returns:
+        dict[str, float]: Measurements keyed by name.
+    """
+    with temp_database():
+        random.seed(seed)
+        conn: sqlite3.Connection = db.get_db_connection()
+        for i in range(num_users):
+            db.init_db(conn, f"bench{i}")
+        games: list[tuple[int, int]] = [(row["user_id"], row["id"]) for row in conn.execute("SELECT * FROM games")]
+        rng: random.Random = random.Random(seed)
+        with conn:
+            conn.executemany(
+                """INSERT INTO highscores (user_id, game_id, score) VALUES (?, ?, ?)""",
+                [(*rng.choice(games), rng.randrange(10_000)) for _ in range(num_scores)],
+            )
+        times: list[float] = []
+        for _ in range(5):
+            start: float = time.perf_counter()
+            db.get_highscores()
+            times.append(time.perf_counter() - start)
+    return {"num_scores": num_scores, "get_highscores_median_ms": statistics.median(times) * 1000}
+
+
+# Benchmark scenarios run by `pim bench`, each called with the seed
+SCENARIOS: dict[str, Callable[..., dict[str, float]]] = {
+    "subgrid_storage": bench_subgrid_storage,
+    "engine_moves": bench_engine_moves,
+    "flood_fill": bench_flood_fill,
+    "render": bench_render,
+    "save": bench_save,
+    "load": bench_load,
+    "highscores": bench_highscores,
+    "click_save": bench_click_save,
+}
+
+
+def run_benchmarks(names: list[str] | None = None, seed: int = 0) -> dict[str, dict[str, float]]:
+    """
+    Run benchmark scenarios.
+
+    Args:
+        names (list[str] | None): Scenarios to run, all if None.
+        seed (int): Seed passed to every scenario.
+
+    Returns:
+        dict[str, dict[str, float]]: Measurements of each scenario keyed by scenario name.
+    """
+    for name in names or []:
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown benchmark {name}, expected one of {', '.join(SCENARIOS)}")
+    return {name: SCENARIOS[name](seed=seed) for name in names or SCENARIOS}
+
+
+def metric_direction(name: str) -> int:
+    """
+    Return 1 if a larger value of the metric is better, -1 if a smaller value is better and 0 if it is not compared.
+    Rates end in _per_sec, times end in _ms or _sec and memory contains bytes.
+    """
+    if name.endswith("_per_sec"):
+        return 1
+    if name.endswith(("_ms", "_sec")) or "bytes" in name:
+        return -1
+    return 0
+
+
+def compare_results(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float = 0.2
+) -> list[str]:
+    """
+    Compare results against a baseline run.
+
+    Args:
+        results (dict[str, dict[str, float]]): Measurements of the current run.
+        baseline (dict[str, dict[str, float]]): Measurements of the baseline run.
+        threshold (float): Fraction a metric may get worse by before it counts as a regression.
+
+    Returns:
+        list[str]: A description of each regression, empty if there are none.
+    """
+    regressions: list[str] = []
+    for scenario, metrics in results.items():
+        for name, value in metrics.items():
+            base: float | None = baseline.get(scenario, {}).get(name)
+            direction: int = metric_direction(name)
+            if not base or not direction:
+                continue
+            change: float = (value - base) / base * direction
+            if change < -threshold:
+                regressions.append(f"{scenario}.{name}: {value:,.6f} vs {base:,.6f} ({change:+.1%})")
+    return regressions
+
+
+def write_results(path: Path, results: dict[str, dict[str, float]], seed: int) -> None:
+    """Write benchmark results and the environment they were measured in to a JSON file."""
+    from par_infini_sweeper import __version__
+
+    data: dict[str, Any] = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "created_ts": int(time.time()),
+        "results": results,
+    }
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
+def read_results(path: Path) -> dict[str, dict[str, float]]:
+    """Read the results of a run written by write_results."""
+    return orjson.loads(path.read_bytes())["results"]
+
+
+def main() -> None:
+    """Run all benchmarks and print the results."""
+    for scenario, metrics in run_benchmarks().items():
+        for name, value in metrics.items():
+            print(f"{scenario}.{name}: {value:,.6f}" if isinstance(value, float) else f"{scenario}.{name}: {value:,}")
+
+
+if __name__ == "__main__":
+    main()
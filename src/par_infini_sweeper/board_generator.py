@@ -0,0 +1,160 @@
+"""Generate large synthetic saved games for load and stress testing."""
+
+from __future__ import annotations
+
+import math
+import random
+import sqlite3
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from par_infini_sweeper import db
+from par_infini_sweeper.engine import FULL_MASK, GridPos, mine_counts, subgrid_layouts
+from par_infini_sweeper.enums import FrontierShape, GameDifficulty
+from par_infini_sweeper.grid_codec import GridData, encode_grid_data
+
+# Offsets of the eight neighbors of a subgrid
+_NEIGHBORS: tuple[GridPos, ...] = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+
+
+def board_positions(num_subgrids: int, shape: FrontierShape, rng: random.Random) -> list[GridPos]:
+    """
+    Return the positions of num_subgrids connected subgrids around the origin, nearest to the origin first.
+
+    Args:
+        num_subgrids (int): Number of positions to return.
+        shape (FrontierShape): Square and circle fill rings around the origin, blob grows randomly from it.
+        rng (random.Random): Random source for blob growth.
+
+    Returns:
+        list[GridPos]: Subgrid positions.
+    """
+    if shape == FrontierShape.BLOB:
+        return _blob_positions(num_subgrids, rng)
+    radius: int = math.isqrt(num_subgrids) // 2 + 2
+    if shape == FrontierShape.CIRCLE:
+        radius = math.isqrt(int(num_subgrids / math.pi)) + 2
+    candidates: list[GridPos] = [(x, y) for x in range(-radius, radius + 1) for y in range(-radius, radius + 1)]
+    if shape == FrontierShape.CIRCLE:
+        candidates.sort(key=lambda pos: pos[0] * pos[0] + pos[1] * pos[1])
+    else:
+        candidates.sort(key=lambda pos: max(abs(pos[0]), abs(pos[1])))
+    return candidates[:num_subgrids]
+
+
+def _blob_positions(num_subgrids: int, rng: random.Random) -> list[GridPos]:
+    positions: list[GridPos] = []
+    # Subgrids bordering the blob, each listed once so the blob grows evenly in every direction.
+    frontier: list[GridPos] = [(0, 0)]
+    seen: set[GridPos] = {(0, 0)}
+    while len(positions) < num_subgrids:
+        i: int = int(rng.random() * len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        sx, sy = pos = frontier.pop()
+        positions.append(pos)
+        for dx, dy in _NEIGHBORS:
+            neighbor: GridPos = (sx + dx, sy + dy)
+            if neighbor not in seen:
+                seen.add(neighbor)
+                frontier.append(neighbor)
+    return positions
+
+
+def _grid_rows(
+    game_id: int,
+    user_id: int,
+    seed: int,
+    positions: list[GridPos],
+    num_mines: int,
+    solved_ratio: float,
+    rng: random.Random,
+    stats: dict[str, int],
+) -> Iterator[tuple[int, int, str, bytes, int, int]]:
+    taken: set[GridPos] = set(positions)
+    for (sx, sy), mines in zip(positions, subgrid_layouts(seed, positions, num_mines)):
+        safe: int = FULL_MASK & ~mines
+        frontier: bool = not (
+            (sx - 1, sy - 1) in taken
+            and (sx, sy - 1) in taken
+            and (sx + 1, sy - 1) in taken
+            and (sx - 1, sy) in taken
+            and (sx + 1, sy) in taken
+            and (sx - 1, sy + 1) in taken
+            and (sx, sy + 1) in taken
+            and (sx + 1, sy + 1) in taken
+        )
+        if not frontier and rng.random() < solved_ratio:
+            data: GridData = GridData(mines, mines, safe, True, False)
+            stats["num_solved"] += 1
+        else:
+            # Frontier subgrids are partly uncovered with a few flags, like a board mid game.
+            uncovered: int = rng.getrandbits(64) & (rng.getrandbits(64) if frontier else FULL_MASK) & safe
+            data = GridData(mines, mines & rng.getrandbits(64), uncovered or safe & -safe, False, False)
+            stats["num_frontier"] += frontier
+        yield game_id, user_id, f"{sx},{sy}", encode_grid_data(data), sx, sy
+
+
+def generate_board(
+    conn: sqlite3.Connection,
+    user_name: str,
+    num_subgrids: int,
+    solved_ratio: float = 0.9,
+    shape: FrontierShape = FrontierShape.BLOB,
+    difficulty: GameDifficulty = GameDifficulty.EASY,
+    seed: int = 0,
+    num_highscores: int = 100,
+) -> dict[str, Any]:
+    """
+    Replace the saved game and highscores of a user with a generated board. The user is created if needed.
+    Subgrids on the edge of the board are partly uncovered, the rest are solved with probability solved_ratio.
+    Mine layouts match the game seed, so the board loads and plays like one saved by the game.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the database.
+        user_name (str): User whose game to replace.
+        num_subgrids (int): Number of saved subgrids to generate.
+        solved_ratio (float): Fraction of subgrids away from the edge that are solved.
+        shape (FrontierShape): Shape of the played area.
+        difficulty (GameDifficulty): Difficulty of the game, sets the number of mines per subgrid.
+        seed (int): Seed for the game layout and everything generated.
+        num_highscores (int): Number of highscores to add for the game.
+
+    Returns:
+        dict[str, Any]: Counts of what was written and the time taken keyed by name.
+    """
+    start: float = time.perf_counter()
+    rng: random.Random = random.Random(seed)
+    db.init_db(conn, user_name)
+    user: dict[str, Any] = db.get_user(conn, user_name)
+    user_id: int = user["id"]
+    game_id: int = user["game"]["id"]
+    game_seed: int = rng.getrandbits(63)
+    positions: list[GridPos] = board_positions(num_subgrids, shape, rng)
+    stats: dict[str, int] = {"num_solved": 0, "num_frontier": 0}
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute("""DELETE FROM grids WHERE user_id = ?""", (user_id,))
+        cursor.execute("""DELETE FROM moves WHERE user_id = ?""", (user_id,))
+        cursor.execute("""DELETE FROM highscores WHERE game_id = ?""", (game_id,))
+        cursor.execute("""UPDATE user_prefs SET difficulty = ? WHERE id = ?""", (difficulty.value, user_id))
+        cursor.execute(
+            """UPDATE games SET game_over = 0, board_offset = '0,0', duration = ?, seed = ?, snapshot_seq = 0
+            WHERE id = ?""",
+            (num_subgrids, game_seed, game_id),
+        )
+        cursor.executemany(
+            """INSERT INTO grids (game_id, user_id, sub_grid_id, grid_data, sx, sy) VALUES (?,?,?,?,?,?)""",
+            _grid_rows(game_id, user_id, game_seed, positions, mine_counts[difficulty], solved_ratio, rng, stats),
+        )
+        max_score: int = max(1, stats["num_solved"] * mine_counts[difficulty])
+        cursor.executemany(
+            """INSERT INTO highscores (game_id, user_id, score) VALUES (?, ?, ?)""",
+            ((game_id, user_id, rng.randint(1, max_score)) for _ in range(num_highscores)),
+        )
+    return {
+        "num_subgrids": len(positions),
+        **stats,
+        "num_highscores": num_highscores,
+        "elapsed_sec": time.perf_counter() - start,
+    }
@@ -3,28 +3,62 @@
 from __future__ import annotations
 
 import os
-import random
+import queue
+import sqlite3
+import threading
 import time
+from collections.abc import Iterable
 from typing import Any
 
-import orjson
 from authlib.integrations.requests_client import OAuth2Session
 from jose import jwt
 from textual.events import MouseEvent
-from textual.geometry import Offset
+from textual.geometry import Offset, Region
 from textual.widget import Widget
 
 from par_infini_sweeper import db
 from par_infini_sweeper.auth import build_auth_client
 from par_infini_sweeper.db import get_db_connection, get_user
-from par_infini_sweeper.enums import GameDifficulty, GameMode
+from par_infini_sweeper.engine import (
+    BLOCK_SIZE,
+    BORDER_MASKS,
+    NEIGHBOR_MASKS,
+    BlockSummary,
+    Board,
+    Cell,
+    GridPos,
+    RevealResult,
+    SubGrid,
+    cell_index,
+    new_seed,
+)
+from par_infini_sweeper.enums import GameMode, ZoomLevel
+from par_infini_sweeper.grid_codec import decode_grid_data, encode_grid_data
 from par_infini_sweeper.models import ChangeNicknameRequest, ChangeNicknameResponse, PostScoreRequest, PostScoreResult
+from par_infini_sweeper.save_queue import SaveBatch, SaveError, SaveQueue
 from par_infini_sweeper.utils import format_duration
 
-GridPos = tuple[int, int]
-
-mine_counts: dict[GameDifficulty, int] = {GameDifficulty.EASY: 8, GameDifficulty.MEDIUM: 12, GameDifficulty.HARD: 16}
-difficulty_mult: dict[GameDifficulty, int] = {GameDifficulty.EASY: 1, GameDifficulty.MEDIUM: 2, GameDifficulty.HARD: 3}
+# Size in cells of the area around the saved offset that is decoded before the first frame
+LOAD_VIEWPORT: GridPos = (200, 80)
+# Extra subgrids decoded around LOAD_VIEWPORT
+LOAD_MARGIN: int = 2
+# Number of logged moves after which save writes a new snapshot of the changed subgrids
+SNAPSHOT_INTERVAL: int = 200
+
+# Text, foreground color and background color used to draw a cell
+CellGlyph = tuple[str, str, str]
+
+# Zoom levels in order from closest to furthest out
+ZOOM_LEVELS: list[ZoomLevel] = [ZoomLevel.NORMAL, ZoomLevel.CELL, ZoomLevel.SUBGRID, ZoomLevel.BLOCK]
+# Cells along each side of the area one character covers. At the normal zoom level each cell is 2 characters wide.
+CELLS_PER_CHAR: dict[ZoomLevel, int] = {
+    ZoomLevel.NORMAL: 1,
+    ZoomLevel.CELL: 1,
+    ZoomLevel.SUBGRID: 8,
+    ZoomLevel.BLOCK: 8 * BLOCK_SIZE,
+}
+# Characters used for subgrids and blocks in the overview zoom levels, from least to most explored
+OVERVIEW_SHADES: str = "·░▒▓█"
 
 # Color mapping based on the count of adjacent mines
 count_to_color: dict[int, str] = {
@@ -40,220 +74,50 @@ count_to_color: dict[int, str] = {
 }
 
 
-class Cell:
-    """Represents a single cell in a subgrid."""
-
-    def __init__(self, parent: SubGrid, is_mine: bool, marked: bool = False, uncovered: bool = False) -> None:
-        self._parent = parent
-        self._is_mine: bool = is_mine
-        self._marked: bool = marked
-        self._uncovered: bool = uncovered
-        self._changed: bool = False
-        self._highlighted: bool = False
-
-    @property
-    def is_mine(self) -> bool:
-        return self._is_mine
-
-    @is_mine.setter
-    def is_mine(self, value: bool) -> None:
-        if self._is_mine != value:
-            self._is_mine = value
-            self.changed = True
-
-    @property
-    def marked(self) -> bool:
-        return self._marked
-
-    @marked.setter
-    def marked(self, value: bool) -> None:
-        if self._marked != value:
-            self._marked = value
-            self.changed = True
-
-    @property
-    def uncovered(self) -> bool:
-        return self._uncovered
-
-    @uncovered.setter
-    def uncovered(self, value: bool) -> None:
-        if self._uncovered != value:
-            self._uncovered = value
-            self.changed = True
-
-    @property
-    def highlighted(self) -> bool:
-        return self._highlighted
-
-    @highlighted.setter
-    def highlighted(self, value: bool) -> None:
-        if self._highlighted != value:
-            self._highlighted = value
-            self.parent.parent.highlighted_cells.add(self) if value else self.parent.parent.highlighted_cells.discard(
-                self
-            )
-
-    @property
-    def parent(self) -> SubGrid:
-        return self._parent
-
-    @property
-    def changed(self) -> bool:
-        return self._changed
-
-    @changed.setter
-    def changed(self, value: bool) -> None:
-        if self._changed != value:
-            self._changed = value
-            if value:
-                self._parent.changed = True
-
-    def to_dict(self) -> dict[str, bool]:
-        """Return a dictionary representation of this cell."""
-        return {"is_mine": self.is_mine, "marked": self.marked, "uncovered": self.uncovered}
-
-    @staticmethod
-    def from_dict(parent: SubGrid, data: dict[str, bool]) -> Cell:
-        """Create a Cell instance from its dictionary representation."""
-        return Cell(parent, data["is_mine"], data["marked"], data["uncovered"])
-
-
-class SubGrid:
-    """Represents an 8×8 subgrid of cells."""
-
-    def __init__(
-        self,
-        parent: GameState,
-        pos: GridPos,
-        difficulty: GameDifficulty | None = None,
-    ) -> None:
-        """
-        Initialize a subgrid at position `pos` with the given difficulty.
-        Optionally ensure that the cell at local coordinate safe_pos is mine‑free.
-
-        Args:
-            parent (GameState): The parent game state.
-            pos (GridPos): The position of the subgrid.
-            difficulty (GameDifficulty | None): The difficulty level of the game.
-        """
-        self._changed: bool = False
-        self.pos: GridPos = pos
-        self.cells: list[list[Cell]] = self.generate_cells(difficulty) if difficulty else []
-        self.solved: bool = False
-        self._parent: GameState = parent
-
-    @property
-    def parent(self) -> GameState:
-        return self._parent
-
-    @property
-    def changed(self) -> bool:
-        return self._changed
-
-    @changed.setter
-    def changed(self, value: bool) -> None:
-        if self._changed != value:
-            self._changed = value
-            if value:
-                self.parent.changed_subgrids.add(self)
-
-    def generate_cells(self, difficulty: GameDifficulty) -> list[list[Cell]]:
-        """
-        Generate an 8×8 grid of cells with mines distributed according to difficulty.
-        The number of mines per subgrid is adjusted as follows:
-          - easy: 8 mines
-          - medium: 12 mines
-          - hard: 16 mines
-        """
-
-        num_mines: int = mine_counts.get(difficulty, 8)
-        positions: list[GridPos] = [(x, y) for y in range(8) for x in range(8)]
-        mine_positions: list[GridPos] = random.sample(positions, num_mines)
-        grid: list[list[Cell]] = []
-        for y in range(8):
-            row: list[Cell] = []
-            for x in range(8):
-                is_mine: bool = (x, y) in mine_positions
-                row.append(Cell(self, is_mine))
-            grid.append(row)
-        return grid
-
-    def to_dict(self) -> dict[str, Any]:
-        """Return a dictionary representation of this subgrid."""
-        return {
-            "pos": self.pos,
-            "cells": [[cell.to_dict() for cell in row] for row in self.cells],
-            "solved": self.solved,
-        }
-
-    def clear_changed(self) -> None:
-        """Clear the changed flag for all cells in the subgrid."""
-        for row in self.cells:
-            for cell in row:
-                cell.changed = False
-        self.changed = False
-
-    @property
-    def key_str(self) -> str:
-        """Return a unique key for this subgrid."""
-        return f"{self.pos[0]},{self.pos[1]}"
-
-    @staticmethod
-    def from_dict(parent: GameState, data: dict[str, Any]) -> SubGrid:
-        """Create a SubGrid instance from its dictionary representation."""
-        sg: SubGrid = SubGrid(parent, tuple(data["pos"]))
-        sg.cells = [[Cell.from_dict(sg, cell) for cell in row] for row in data["cells"]]
-        sg.solved = data.get("solved", False)
-        if sg.solved:
-            return sg
-        # Ensure that the subgrid is solved if all non-mine cells are uncovered.
-        for row in sg.cells:
-            for cell in row:
-                if not cell.is_mine and not cell.uncovered:
-                    return sg
-        sg.solved = True
-
-        for row in sg.cells:
-            for cell in row:
-                if cell.is_mine and not cell.marked:
-                    cell.marked = True
-
-        return sg
-
-
-class GameState:
-    """Represents the overall game state including difficulty and all subgrids."""
+class GameState(Board):
+    """
+    Adapts the board engine to the app: persists moves and subgrids, loads saved games
+    and notifies the parent widget of changes.
+    """
 
     def __init__(self, parent: Widget | None, user: dict[str, Any]) -> None:
         self.parent = parent
         self.mode: GameMode = GameMode.INFINITE
         self.user: dict[str, Any] = user
-        self.difficulty: GameDifficulty = user["prefs"]["difficulty"]
         self.theme: str = user["prefs"]["theme"]
-        self.subgrids: dict[GridPos, SubGrid] = {}
-        self.subgrids[(0, 0)] = SubGrid(self, (0, 0), self.difficulty)
+        # Saved subgrids that have not been decoded yet. See load.
+        self.pending_subgrids: set[GridPos] = set()
+        self._loaded_queue: queue.SimpleQueue[SubGrid | None] = queue.SimpleQueue()
+        self._loader: threading.Thread | None = None
+        self._loader_stop: threading.Event = threading.Event()
+        self.save_queue: SaveQueue = SaveQueue()
+        # Moves are logged as they are made and subgrids are only written with each snapshot, see save
+        self.snapshot_seq: int = user["game"]["snapshot_seq"]
+        self.move_seq: int = self.snapshot_seq
+        self.pending_moves: list[tuple[int, str, int, int, float]] = []
+        self.replaying: bool = False
         game: dict[str, Any] = user["game"]
+        super().__init__(game["seed"], user["prefs"]["difficulty"], game["game_over"])
         offset: list[str] = game["board_offset"].split(",")
         assert len(offset) == 2
         self.offset = Offset(int(offset[0]), int(offset[1]))
-        self.num_solved: int = 0
         self.started_ts: int = int(time.time())
         self.duration: int = game["duration"]
-        self.game_over: bool = game["game_over"]
+        # Metadata as it is in the database, see save
+        self.saved_prefs: tuple[str, str] = (self.theme, self.difficulty.value)
+        self.saved_game: tuple[bool, str, int, int] = (self.game_over, game["board_offset"], self.duration, self.seed)
         self.num_grids_saved: int = 0
-        self.highlighted_cells: set[Cell] = set()
-        self.changed_subgrids: set[SubGrid] = set()
         self.mouse_grid: SubGrid | None = None
         self.paused: bool = False
         self.xray: bool = False
         self._auth_client: OAuth2Session | None = None
-        self.first_click: bool = True
         self.mouse_pos: GridPos = 0, 0
         self.mouse_global_grid_coord: GridPos = 0, 0
         self.mouse_sg_coord: GridPos = (self.mouse_global_grid_coord[0] // 8, self.mouse_global_grid_coord[1] // 8)
         self.shift_pressed: bool = False
         self.ctrl_pressed: bool = False
         self.highlighted_subgrid: bool = False
+        self.zoom: ZoomLevel = ZoomLevel.NORMAL
 
     def to_dict(self) -> dict[str, Any]:
         """Return a dictionary representation of the game state."""
@@ -265,6 +129,7 @@ class GameState:
             "started_ts": self.started_ts,
             "duration": self.duration,
             "offset": (self.offset.x, self.offset.y),
+            "seed": self.seed,
             "subgrids": {f"{k[0]},{k[1]}": sg.to_dict() for k, sg in self.subgrids.items()},
             "first_click": self.first_click,
         }
@@ -280,17 +145,61 @@ class GameState:
             GridPos: The global cell coordinates (gx, gy)
         """
 
-        gx: int = (event.x // 2) + self.offset.x
-        gy: int = event.y + self.offset.y
+        if self.zoom == ZoomLevel.NORMAL:
+            return (event.x // 2) + self.offset.x, event.y + self.offset.y
+        # The cell at the center of the area under the mouse
+        scale: int = CELLS_PER_CHAR[self.zoom]
+        gx: int = (self.offset.x // scale + event.x) * scale + scale // 2
+        gy: int = (self.offset.y // scale + event.y) * scale + scale // 2
         return gx, gy
 
+    def cells_region(self, gx: int, gy: int, width: int = 1, height: int = 1) -> Region:
+        """
+        Return the region of the parent widget that shows a block of cells.
+
+        Args:
+            gx (int): The global x-coordinate of the top left cell
+            gy (int): The global y-coordinate of the top left cell
+            width (int): The number of cells across
+            height (int): The number of cells down
+
+        Returns:
+            Region: The region in content coordinates, which may lie partly or wholly off screen
+        """
+        if self.zoom == ZoomLevel.NORMAL:
+            return Region((gx - self.offset.x) * 2, gy - self.offset.y, width * 2, height)
+        scale: int = CELLS_PER_CHAR[self.zoom]
+        left: int = gx // scale - self.offset.x // scale
+        top: int = gy // scale - self.offset.y // scale
+        right: int = (gx + width - 1) // scale - self.offset.x // scale + 1
+        bottom: int = (gy + height - 1) // scale - self.offset.y // scale + 1
+        return Region(left, top, right - left, bottom - top)
+
+    def refresh_regions(self, regions: Iterable[Region]) -> None:
+        """Repaint only the given regions of the parent widget, skipping any that are off screen."""
+        if not self.parent:
+            return
+        visible: Region = self.parent.size.region
+        dirty: list[Region] = [clipped for region in regions if (clipped := region.intersection(visible))]
+        if dirty:
+            self.parent.refresh(*dirty)
+
+    def refresh_cells(self, cells: Iterable[GridPos]) -> None:
+        """Repaint the given cells of the parent widget."""
+        self.refresh_regions(self.cells_region(gx, gy) for gx, gy in cells)
+
+    def refresh_subgrids(self, sg_coords: Iterable[GridPos]) -> None:
+        """Repaint the given subgrids of the parent widget."""
+        self.refresh_regions(self.cells_region(sx * 8, sy * 8, 8, 8) for sx, sy in sg_coords)
+
     def update_mouse_info(self, event: MouseEvent):
+        previous_sg_coord: GridPos = self.mouse_sg_coord
         self.mouse_pos = event.x, event.y
         self.mouse_global_grid_coord = self.mouse_to_global_grid_coords(event)
         self.mouse_sg_coord = (self.mouse_global_grid_coord[0] // 8, self.mouse_global_grid_coord[1] // 8)
 
-        if self.parent and self.highlighted_subgrid:
-            self.parent.refresh()
+        if self.highlighted_subgrid and self.mouse_sg_coord != previous_sg_coord:
+            self.refresh_subgrids((previous_sg_coord, self.mouse_sg_coord))
 
         self.shift_pressed = event.shift
         self.ctrl_pressed = event.ctrl
@@ -369,21 +278,26 @@ class GameState:
         return result
 
     def new_game(self) -> None:
-        """Start a new game by resetting the game state."""
+        """
+        Start a new game by resetting the game state.
+
+        Raises:
+            SaveError: If saves of the current game could not be committed, the current game is kept
+        """
 
-        sg = SubGrid(self, (0, 0), self.difficulty)
-        sg.changed = True
-        self.subgrids = {(0, 0): sg}
+        self.stop_loading()
+        # Queued saves of the old game must not land after its grids are deleted.
+        self.flush()
+        self.reset(new_seed())
         self.offset = Offset(0, 0)
-        self.num_solved = 0
         self.started_ts = int(time.time())
         self.duration = 0
         self.num_grids_saved = 0
-        self.game_over = False
-        self.clear_highlighted()
-        self.clear_changed()
         self.xray = False
-        self.first_click = True
+
+        self.pending_moves = []
+        self.move_seq = 0
+        self.snapshot_seq = 0
 
         conn = db.get_db_connection()
         with conn:
@@ -393,15 +307,15 @@ class GameState:
                 """DELETE FROM grids WHERE user_id = ?""",
                 (self.user["id"],),
             )
-        self.save()
-
-    def compute_board_center(self) -> Offset:
-        """Compute the center of the game board in cells based on subgrid positions."""
-        c = (0, 0)
-        for k in self.subgrids.keys():
-            c = (c[0] + k[0] * 8, c[1] + k[1] * 8)
+            cursor.execute("""DELETE FROM moves WHERE user_id = ?""", (self.user["id"],))
+            cursor.execute("""UPDATE games SET snapshot_seq = 0 WHERE user_id = ?""", (self.user["id"],))
+        self.save(snapshot=True)
 
-        return Offset(c[0] // len(self.subgrids) + 5, c[1] // len(self.subgrids) - 3)
+    @property
+    def board_center(self) -> Offset:
+        """Return the center of the game board in cells based on subgrid positions."""
+        cx, cy = self.centroid
+        return Offset(cx + 5, cy - 3)
 
     @property
     def num_changed(self) -> int:
@@ -409,17 +323,27 @@ class GameState:
 
     @property
     def num_subgrids(self) -> int:
-        return len(self.subgrids)
+        return len(self.subgrids) + len(self.pending_subgrids)
 
     @staticmethod
-    def load(parent: Widget | None, user_name: str, nickname: str | None = None) -> GameState:
+    def load(
+        parent: Widget | None,
+        user_name: str,
+        nickname: str | None = None,
+        lazy: bool = True,
+        viewport: GridPos = LOAD_VIEWPORT,
+    ) -> GameState:
         """
         Load the game state from the SQLite database or create a new one.
+        Only the subgrids in and around the saved viewport are decoded before returning.
+        The rest are decoded on a background thread when lazy, otherwise immediately.
 
         Args:
             parent (Widget): The parent widget.
             user_name (str): The name of the user.
             nickname (str | None): The nickname of the user.
+            lazy (bool): Whether to decode subgrids outside the viewport in the background.
+            viewport (GridPos): Width and height in cells of the area to decode first.
         """
         with db.get_db_connection() as conn:
             user = get_user(conn, user_name, nickname)
@@ -427,41 +351,220 @@ class GameState:
             game = user["game"]
             state = GameState(parent, user)
 
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM grids WHERE game_id = ? AND user_id = ?",
-                (
-                    game["id"],
-                    user_id,
-                ),
-            )
+            state.add_pending(db.get_subgrid_positions(conn, game["id"], user_id))
+            if lazy:
+                x0: int = (state.offset.x >> 3) - LOAD_MARGIN
+                y0: int = (state.offset.y >> 3) - LOAD_MARGIN
+                x1: int = ((state.offset.x + viewport[0]) >> 3) + LOAD_MARGIN
+                y1: int = ((state.offset.y + viewport[1]) >> 3) + LOAD_MARGIN
+                rows: list[sqlite3.Row] = db.get_subgrids_in_rect(conn, game["id"], user_id, x0, y0, x1, y1)
+                rows += db.get_subgrids_at(conn, game["id"], user_id, [(0, 0)])
+            else:
+                rows = list(db.iter_subgrids(conn, game["id"], user_id))
+            for row in rows:
+                state.insert_loaded_subgrid(state.subgrid_from_row(row))
+            state.first_click = state.num_uncovered == 0 and not state.pending_subgrids
+            state.move_seq = max(state.snapshot_seq, db.get_last_move_seq(conn, game["id"], user_id))
+            state.replay_moves(db.get_moves(conn, game["id"], user_id, state.snapshot_seq))
+
+        if state.pending_subgrids:
+            state.start_background_load()
+        return state
 
-            state.num_solved = 0
-            row = cursor.fetchone()
-            while row:
-                key_parts: list[str] = row["sub_grid_id"].split(",")
-                coords: GridPos = (int(key_parts[0]), int(key_parts[1]))
-                sg_data = orjson.loads(row["grid_data"])
-                sg: SubGrid = SubGrid.from_dict(state, sg_data)
-                state.subgrids[coords] = sg
-                if sg.solved:
-                    state.num_solved += 1
-                for row in sg.cells:
-                    if not state.first_click:
-                        break
-                    for cell in row:
-                        if cell.uncovered:
-                            state.first_click = False
-                            break
-                row = cursor.fetchone()
+    def fault_in_subgrids(self, positions: list[GridPos], conn: sqlite3.Connection | None = None) -> None:
+        """
+        Decode the given saved subgrids from the database and add them to the board.
 
-        return state
+        Args:
+            positions (list[GridPos]): Coordinates of subgrids in pending_subgrids
+            conn (sqlite3.Connection | None): Connection to use, a new one is opened if None
+        """
+        positions = [pos for pos in positions if pos in self.pending_subgrids]
+        if not positions:
+            return
+        conn = conn or db.get_db_connection()
+        for row in db.get_subgrids_at(conn, self.user["game"]["id"], self.user["id"], positions):
+            self.insert_loaded_subgrid(self.subgrid_from_row(row))
+        # Anything left had no row, so forget about it.
+        self.forget_pending(positions)
+
+    def subgrid_from_row(self, row: sqlite3.Row) -> SubGrid:
+        """
+        Decode a subgrid from a grids row returned by the db subgrid queries.
+
+        Args:
+            row (sqlite3.Row): Row with sx, sy and grid_data columns
+
+        Returns:
+            SubGrid: The decoded subgrid
+        """
+        return SubGrid.from_grid_data(self, (row["sx"], row["sy"]), decode_grid_data(row["grid_data"]))
+
+    def get_subgrid(self, sg_coord: GridPos) -> SubGrid | None:
+        """
+        Return the subgrid at sg_coord, decoding it from the database first if it has not been loaded yet.
+
+        Args:
+            sg_coord (GridPos): The coordinates of the subgrid
+
+        Returns:
+            SubGrid | None: The subgrid or None if it does not exist
+        """
+        subgrid: SubGrid | None = self.subgrids.get(sg_coord)
+        if subgrid is None and self.pending_subgrids:
+            if sg_coord in self.pending_subgrids:
+                self.fault_in_subgrids([sg_coord])
+            else:
+                # A pristine subgrid is regenerated once one of its saved neighbors is loaded.
+                sx, sy = sg_coord
+                self.fault_in_subgrids([(sx + dsx, sy + dsy) for dsx in (-1, 0, 1) for dsy in (-1, 0, 1)])
+            subgrid = self.subgrids.get(sg_coord)
+        return subgrid
+
+    def load_cell_neighbors(self, gx: int, gy: int) -> None:
+        """
+        Load every subgrid touching the cell at (gx, gy) so that its cached mine count is complete.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+        """
+        if not self.pending_subgrids:
+            return
+        sx: int = gx >> 3
+        sy: int = gy >> 3
+        for dsx, dsy, _ in NEIGHBOR_MASKS[cell_index(gx & 7, gy & 7)]:
+            if (sx + dsx, sy + dsy) not in self.subgrids:
+                self.get_subgrid((sx + dsx, sy + dsy))
+
+    def load_subgrids(self, positions: set[GridPos]) -> set[GridPos]:
+        """
+        Decode any of the missing subgrids at positions that were saved but not loaded yet.
+
+        Args:
+            positions (set[GridPos]): Coordinates of subgrids that are not on the board
+
+        Returns:
+            set[GridPos]: The positions that were never saved and need to be generated
+        """
+        saved: set[GridPos] = positions & self.pending_subgrids
+        if not saved:
+            return positions
+        self.fault_in_subgrids(list(saved))
+        return positions - saved
+
+    def add_pending(self, positions: Iterable[GridPos]) -> None:
+        """
+        Record saved subgrids that have not been loaded yet. Their positions count towards the board
+        bounds and centroid right away, so they are complete before loading finishes.
+
+        Args:
+            positions (Iterable[GridPos]): Coordinates of the saved subgrids
+        """
+        for pos in positions:
+            # A subgrid already on the board stops being counted when the saved one replaces it
+            if pos not in self.pending_subgrids:
+                self.pending_subgrids.add(pos)
+                self.update_occupancy(pos, 1)
+
+    def forget_pending(self, positions: Iterable[GridPos]) -> None:
+        """
+        Stop waiting for pending subgrids that will not be loaded, removing them from the occupancy.
 
-    def score(self) -> int:
-        """Calculate the score based on the number of solved subgrids and difficulty."""
-        return self.num_solved * mine_counts.get(self.difficulty, 8)
+        Args:
+            positions (Iterable[GridPos]): Coordinates of the subgrids to forget
+        """
+        for pos in positions:
+            if pos in self.pending_subgrids:
+                self.pending_subgrids.discard(pos)
+                self.update_occupancy(pos, -1)
+
+    def insert_loaded_subgrid(self, subgrid: SubGrid) -> bool:
+        """
+        Add a subgrid decoded from the database to the board if it is still pending, then regenerate its pristine neighbors.
+
+        Args:
+            subgrid (SubGrid): The decoded subgrid
+
+        Returns:
+            bool: True if the subgrid was added
+        """
+        if subgrid.pos not in self.pending_subgrids:
+            return False
+        self.pending_subgrids.discard(subgrid.pos)
+        self.insert_subgrid(subgrid, counted=True)
+        self.regenerate_pristine_neighbors([subgrid])
+        return True
+
+    @property
+    def is_loading(self) -> bool:
+        """Return True while saved subgrids are still waiting to be decoded."""
+        return bool(self.pending_subgrids)
+
+    def start_background_load(self) -> None:
+        """Start decoding the pending subgrids on a background thread. Results are added by drain_loaded."""
+        self._loader_stop.clear()
+        self._loader = threading.Thread(
+            target=self._background_load,
+            args=(frozenset(self.pending_subgrids), self.user["game"]["id"], self.user["id"]),
+            name="pim-subgrid-loader",
+            daemon=True,
+        )
+        self._loader.start()
+
+    def _background_load(self, positions: frozenset[GridPos], game_id: int, user_id: int) -> None:
+        conn = db.get_db_connection()
+        try:
+            for row in db.iter_subgrids(conn, game_id, user_id):
+                if self._loader_stop.is_set():
+                    break
+                if (row["sx"], row["sy"]) in positions:
+                    self._loaded_queue.put(self.subgrid_from_row(row))
+        finally:
+            db.close_db_connection()
+            self._loaded_queue.put(None)
+
+    def drain_loaded(self) -> int:
+        """
+        Add the subgrids decoded by the background loader to the board. Must be called from the main thread.
+
+        Returns:
+            int: The number of subgrids added
+        """
+        added: int = 0
+        while True:
+            try:
+                subgrid: SubGrid | None = self._loaded_queue.get_nowait()
+            except queue.Empty:
+                break
+            if subgrid is None:
+                # The loader is done, anything still pending had no row.
+                self._loader = None
+                self.forget_pending(list(self.pending_subgrids))
+                break
+            if self.insert_loaded_subgrid(subgrid):
+                added += 1
+        return added
+
+    def finish_loading(self) -> None:
+        """Block until every saved subgrid has been added to the board."""
+        if self._loader:
+            self._loader.join()
+            self.drain_loaded()
+        self.fault_in_subgrids(list(self.pending_subgrids))
+
+    def stop_loading(self) -> None:
+        """Abandon any background load and forget pending subgrids."""
+        if self._loader:
+            self._loader_stop.set()
+            self._loader.join()
+            self._loader = None
+        while not self._loaded_queue.empty():
+            self._loaded_queue.get_nowait()
+        self.forget_pending(list(self.pending_subgrids))
 
     def save_score(self) -> None:
+        self.finish_loading()
         score = self.score()
         if score == 0:
             return
@@ -473,285 +576,239 @@ class GameState:
                 (self.user["game"]["id"], self.user["id"], score),
             )
 
-    def save(self) -> int:
+    def save(self, snapshot: bool = False) -> int:
         """
-        Save the game state to the SQLite database.
+        Queue the game state to be written to the SQLite database by the background writer.
+        Moves made since the last save are appended to the move log. Changed subgrids are only written
+        as a snapshot when requested or once SNAPSHOT_INTERVAL moves have been logged since the last one,
+        and the moves the snapshot covers are removed from the log when it is committed.
+        Use flush to wait until it has been committed.
+
+        Args:
+            snapshot (bool): Whether to write a snapshot now
 
         Returns:
             int: The number of subgrids saved.
         """
-        with db.get_db_connection() as conn:
-            self.user["prefs"] = {"theme": self.theme, "difficulty": self.difficulty}
-            user_id = self.user["id"]
-            self.user["game"]["duration"] = self.duration
-            self.user["game"]["game_over"] = self.game_over
-            self.user["game"]["board_offset"] = f"{self.offset.x},{self.offset.y}"
+        # Replayed moves are already in the log and the snapshot must not include a partial replay.
+        if self.replaying:
+            return 0
+        self.user["prefs"] = {"theme": self.theme, "difficulty": self.difficulty}
+        self.user["game"]["duration"] = self.duration
+        self.user["game"]["game_over"] = self.game_over
+        self.user["game"]["board_offset"] = f"{self.offset.x},{self.offset.y}"
+        self.user["game"]["seed"] = self.seed
+        batch: SaveBatch = SaveBatch(user_id=self.user["id"], game_id=self.user["game"]["id"])
+        # Only write metadata that differs from what was last saved.
+        prefs: tuple[str, str] = (self.theme, self.difficulty.value)
+        if prefs != self.saved_prefs:
+            batch.prefs = self.saved_prefs = prefs
+        game: tuple[bool, str, int, int] = (
+            self.user["game"]["game_over"],
+            self.user["game"]["board_offset"],
+            self.user["game"]["duration"],
+            self.user["game"]["seed"],
+        )
+        if game != self.saved_game:
+            batch.game = self.saved_game = game
+        batch.moves, self.pending_moves = self.pending_moves, []
+        self.num_grids_saved = 0
+        if snapshot or self.move_seq - self.snapshot_seq >= SNAPSHOT_INTERVAL:
+            self.add_snapshot(batch)
+        if batch.is_empty:
+            self.save_queue.num_skipped += 1
+        else:
+            self.save_queue.submit(batch)
+        return self.num_grids_saved
 
-            cursor = conn.cursor()
-            cursor.execute(
-                """UPDATE user_prefs SET theme = ?, difficulty = ? WHERE id = ?""",
-                (self.theme, self.difficulty.value, user_id),
-            )
-            cursor.execute(
-                """UPDATE games SET game_over = ?, board_offset = ?, duration = ? WHERE user_id = ?""",
-                (
-                    self.user["game"]["game_over"],
-                    self.user["game"]["board_offset"],
-                    self.user["game"]["duration"],
-                    user_id,
-                ),
-            )
+    def add_snapshot(self, batch: SaveBatch) -> None:
+        """
+        Add the subgrids changed since the last snapshot to a save batch and mark it as a snapshot of the latest move.
 
-            # Save each subgrid using upsert.
-            self.num_grids_saved = 0
-            for sg in self.changed_subgrids:
-                self.num_grids_saved += 1
-                sg.clear_changed()
-                sub_grid_id = f"{sg.pos[0]},{sg.pos[1]}"
-                grid_data = orjson.dumps(sg.to_dict()).decode("utf-8")
-                cursor.execute(
-                    """INSERT OR REPLACE INTO grids (game_id, user_id, sub_grid_id, grid_data) VALUES (?,?,?,?)""",
-                    (self.user["game"]["id"], user_id, sub_grid_id, grid_data),
-                )
-            self.clear_changed()
-        return self.num_grids_saved
+        Args:
+            batch (SaveBatch): The batch to add to
+        """
+        if self.move_seq != self.snapshot_seq:
+            batch.snapshot_seq = self.snapshot_seq = self.move_seq
+        # Save each played subgrid using upsert. Pristine subgrids are regenerated from the seed on load.
+        for sg in self.changed_subgrids:
+            sg.clear_changed()
+            if sg.is_pristine:
+                if sg.persisted:
+                    batch.grids[sg.key_str] = None
+                    sg.persisted = False
+                continue
+            self.num_grids_saved += 1
+            batch.grids[sg.key_str] = (sg.pos[0], sg.pos[1], encode_grid_data(sg.to_grid_data()))
+            sg.persisted = True
+        self.clear_changed()
+
+    def flush(self) -> None:
+        """
+        Block until all queued saves have been committed.
+
+        Raises:
+            SaveError: If the saves could not be committed
+        """
+        self.save_queue.flush()
+
+    def close(self) -> None:
+        """
+        Stop background loading, commit all queued saves and stop the writer thread.
+
+        Raises:
+            SaveError: If the last saves could not be committed
+        """
+        self.stop_loading()
+        self.save_queue.close()
 
     @property
     def time_played(self) -> str:
         """Calculate the time played in a human-readable format."""
         return format_duration(self.duration)
 
-    def clear_highlighted(self) -> None:
-        """Clear the highlighted flag for all cells in all subgrids."""
-        for cell in list(self.highlighted_cells):
-            cell.highlighted = False
-        self.highlighted_cells.clear()
+    def regenerate_pristine_neighbors(self, subgrids: list[SubGrid]) -> None:
+        """
+        Recreate the unsaved subgrids that border uncovered cells of the given subgrids.
+        These were generated during play but never persisted because they are untouched.
 
-    def clear_changed(self) -> None:
-        """Clear the changed flag for all subgrids."""
-        for sg in list(self.changed_subgrids):
-            sg.clear_changed()
-        self.changed_subgrids.clear()
+        Args:
+            subgrids (list[SubGrid]): Subgrids loaded from the database
+        """
+        for subgrid in subgrids:
+            if not subgrid.uncovered:
+                continue
+            sx, sy = subgrid.pos
+            for dsx, dsy in BORDER_MASKS:
+                # cells of this subgrid that touch the neighbor at (dsx, dsy)
+                if not subgrid.uncovered & BORDER_MASKS[(-dsx, -dsy)]:
+                    continue
+                n_sg: GridPos = (sx + dsx, sy + dsy)
+                if n_sg not in self.subgrids and n_sg not in self.pending_subgrids:
+                    self.insert_subgrid(SubGrid(self, n_sg, self.difficulty))
 
-    def global_to_cell(self, gx: int, gy: int, create_if_needed: bool = False) -> Cell | None:
+    def reveal(self, gx: int, gy: int) -> RevealResult:
         """
-        Convert global coordinates to local cell coordinates.
+        Reveal the cell at (gx, gy) as a player move and log it.
 
         Args:
             gx (int): The global x-coordinate of the cell
             gy (int): The global y-coordinate of the cell
-            create_if_needed (bool): Whether to create the subgrid if it does not exist
 
         Returns:
-            Cell | None: The cell at the given coordinates, or None if the subgrid does not exist and create_if_needed is False
+            RevealResult: Summary of the cells and subgrids that changed
         """
-        sg_coord: GridPos = (gx // 8, gy // 8)
-        local_x: int = gx % 8
-        local_y: int = gy % 8
-        if sg_coord not in self.subgrids:
-            if not create_if_needed:
-                return None
-            self.subgrids[sg_coord] = SubGrid(self, sg_coord, self.difficulty)
-            self.subgrids[sg_coord].changed = True
-        subgrid: SubGrid = self.subgrids[sg_coord]
-        return subgrid.cells[local_y][local_x]
+        result: RevealResult = super().reveal(gx, gy)
+        if result.blocked and self.parent:
+            self.parent.notify("No uncovered neighbors")
+        if result.changed:
+            self.record_move("reveal", gx, gy)
+        if result.hit_mine:
+            self.end_game()
+        return result
 
-    def cell_has_uncovered_neighbor(self, gx: int, gy: int) -> bool:
+    def chord(self, gx: int, gy: int) -> RevealResult:
         """
-        Check whether the cell at (gx, gy) has at least one uncovered neighbor.
+        Reveal the neighbors of the cell at (gx, gy) as a player move and log it. See Board.chord.
 
         Args:
             gx (int): The global x-coordinate of the cell
             gy (int): The global y-coordinate of the cell
 
         Returns:
-            bool: True if the cell has at least one uncovered neighbor, False otherwise
+            RevealResult: Summary of the cells and subgrids that changed
         """
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx: int = gx + dx
-                ny: int = gy + dy
-                n_sg: GridPos = (nx // 8, ny // 8)
-                if n_sg in self.subgrids:
-                    subgrid: SubGrid = self.subgrids[n_sg]
-                    lx: int = nx % 8
-                    ly: int = ny % 8
-                    if subgrid.cells[ly][lx].uncovered or subgrid.cells[ly][lx].is_mine:
-                        return True
-        return False
+        result: RevealResult = super().chord(gx, gy)
+        if result.changed:
+            self.record_move("chord", gx, gy)
+        if result.hit_mine:
+            self.end_game()
+        return result
 
-    def count_adjacent_flags_mines(self, gx: int, gy: int) -> tuple[int, int]:
+    def mark(self, gx: int, gy: int) -> bool:
         """
-        Count the number of mines adjacent to the cell at (gx, gy). Generates any adjacent subgrid that has not yet been created.
+        Toggle the mark on the cell at (gx, gy) as a player move and log it.
 
         Args:
             gx (int): The global x-coordinate of the cell
             gy (int): The global y-coordinate of the cell
 
         Returns:
-            tuple[int, int]: A tuple containing the number of flagged cells and the number of mines
-
+            bool: True if the mark changed
         """
-        mine_count: int = 0
-        flag_count: int = 0
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx: int = gx + dx
-                ny: int = gy + dy
-                n_sg: GridPos = (nx // 8, ny // 8)
-                if n_sg not in self.subgrids:
-                    continue
-                subgrid: SubGrid = self.subgrids[n_sg]
-                lx: int = nx % 8
-                ly: int = ny % 8
-                if subgrid.cells[ly][lx].is_mine:
-                    mine_count += 1
-                if subgrid.cells[ly][lx].marked:
-                    flag_count += 1
-        return flag_count, mine_count
+        changed: bool = super().mark(gx, gy)
+        if changed:
+            self.record_move("mark", gx, gy)
+        return changed
+
+    def end_game(self) -> None:
+        """Persist the board and the score after a mine was hit. Does nothing while replaying."""
+        if self.replaying:
+            return
+        self.save(snapshot=True)
+        try:
+            self.flush()
+        except SaveError as e:
+            # The score must not be recorded for a board that was not saved
+            if self.parent:
+                self.parent.notify(f"{e}, score not recorded", severity="error")
+        else:
+            self.save_score()
+        if self.parent:
+            self.parent.refresh()
 
-    def reveal_cell(self, gx: int, gy: int, depth: int = 0) -> None:
+    def record_move(self, kind: str, gx: int, gy: int) -> None:
         """
-        Reveal the cell at global coordinates (gx, gy). If it is a mine the game ends. Also, generate any adjacent subgrids as needed.
+        Append a move to the log written by the next save. Moves are not logged while replaying.
 
         Args:
+            kind (str): One of reveal, mark or chord
             gx (int): The global x-coordinate of the cell
             gy (int): The global y-coordinate of the cell
-            depth (int): The depth of the recursion (to prevent infinite recursion)
         """
-        if self.game_over:
-            return
-        sg_coord: GridPos = (gx // 8, gy // 8)
-        assert self.parent
-        # For non-initial subgrids, only allow a reveal if at least one neighbor is uncovered.
-        if sg_coord != (0, 0) and not self.cell_has_uncovered_neighbor(gx, gy):
-            self.parent.notify("No uncovered neighbors")
-            return
-
-        cell: Cell | None = self.global_to_cell(gx, gy, True)
-        # Do nothing if cell is marked or uncovered.
-        if not cell or cell.marked or cell.uncovered:
+        if self.replaying:
             return
+        self.move_seq += 1
+        self.pending_moves.append((self.move_seq, kind, gx, gy, time.time()))
 
-        cell.uncovered = True
-        if cell.uncovered and cell.is_mine:
-            if not self.first_click:
-                self.game_over = True
-                self.save()
-                self.save_score()
-                self.parent.refresh()
-                return
-            cell.is_mine = False
-            # move mine to a surrounding cell
-            border_cell: Cell | None = None
-            for dx in [-1, 0, 1]:
-                if border_cell:
-                    break
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-                    nx: int = gx + dx
-                    ny: int = gy + dy
-                    border_cell: Cell | None = self.global_to_cell(nx, ny, True)
-                    if border_cell and not border_cell.is_mine:
-                        border_cell.is_mine = True
-                        break
-                    border_cell = None
-        # Generate any adjacent subgrids.
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx: int = gx + dx
-                ny: int = gy + dy
-                n_sg: GridPos = (nx // 8, ny // 8)
-                if n_sg not in self.subgrids:
-                    self.subgrids[n_sg] = SubGrid(self, n_sg, self.difficulty)
-                    self.subgrids[n_sg].changed = True
-
-        # Prevent infinite recursion by limiting depth.
-        if depth < 250:
-            # If the cell has 0 neighboring mines, recursively reveal its neighbors.
-            counts: tuple[int, int] = self.count_adjacent_flags_mines(gx, gy)
-            if counts[1] == 0:
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        if dx == 0 and dy == 0:
-                            continue
-                        nx: int = gx + dx
-                        ny: int = gy + dy
-                        self.reveal_cell(nx, ny, depth + 1)
-        self.check_subgrid_solved(sg_coord)
-
-    def reveal_surround(self, gx: int, gy: int) -> None:
-        """
-        Reveal surrounding cells if the cell at (gx, gy) is uncovered and the number of flagged cells matches the number of mines.
+    def replay_moves(self, moves: list[sqlite3.Row]) -> None:
+        """
+        Re-apply logged moves on top of the loaded snapshot.
 
         Args:
-            gx (int): The global x-coordinate of the cell
-            gy (int): The global y-coordinate of the cell
-
+            moves (list[sqlite3.Row]): Rows from db.get_moves in sequence order
         """
-        if self.game_over:
-            return
-        cell: Cell | None = self.global_to_cell(gx, gy)
-        if not cell or not cell.uncovered:
-            return
-        counts: tuple[int, int] = self.count_adjacent_flags_mines(gx, gy)
-        if not counts[0]:
-            return
-
-        if cell.uncovered:
-            if counts[0] != counts[1]:
-                # self.notify("Flag count does not match mine count", severity="error")
-                return
-
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-                    nx: int = gx + dx
-                    ny: int = gy + dy
-                    self.reveal_cell(nx, ny)
-        self.save()
-        assert self.parent
-
-        self.parent.refresh()
+        self.replaying = True
+        try:
+            for move in moves:
+                if move["kind"] == "reveal":
+                    self.reveal(move["gx"], move["gy"])
+                elif move["kind"] == "mark":
+                    self.mark(move["gx"], move["gy"])
+                elif move["kind"] == "chord":
+                    self.chord(move["gx"], move["gy"])
+        finally:
+            self.replaying = False
 
-    def highlight_neighbors(self, gx: int, gy: int) -> None:
+    def highlight_neighbors(self, gx: int, gy: int) -> bool:
         """
-        Highlight the cell neighbors around (gx, gy).
+        Highlight the covered neighbors of the uncovered cell at (gx, gy) and repaint them.
+
         Args:
             gx (int): The global x-coordinate of the cell
             gy (int): The global y-coordinate of the cell
-        """
-        if self.game_over:
-            return
-        cell: Cell | None = self.global_to_cell(gx, gy)
-        if not cell or not cell.uncovered:
-            return
-        counts: tuple[int, int] = self.count_adjacent_flags_mines(gx, gy)
-        # if no neighboring mines do not highlight
-        if not counts[1]:
-            return
 
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                cell = self.global_to_cell(gx + dx, gy + dy)
-                if cell and not cell.uncovered:
-                    cell.highlighted = True
-        assert self.parent
-        self.parent.refresh()
+        Returns:
+            bool: True if any neighbors were highlighted
+        """
+        highlighted: bool = super().highlight_neighbors(gx, gy)
+        if highlighted:
+            self.refresh_regions([self.cells_region(gx - 1, gy - 1, 3, 3)])
+        return highlighted
 
     def toggle_mark(self, gx: int, gy: int, surround: bool = False) -> None:
         """
-        Toggle the mark (flag) on the cell at global coordinates (gx, gy).
+        Toggle the mark (flag) on the cell at global coordinates (gx, gy), then save and repaint what changed.
 
         Args:
             gx (int): The global x-coordinate of the cell
@@ -764,78 +821,121 @@ class GameState:
         if cell.uncovered:
             if not surround:
                 return
-            self.reveal_surround(gx, gy)
+            result: RevealResult = self.chord(gx, gy)
+            self.refresh_subgrids(result.subgrids_touched | result.subgrids_created)
+        elif self.mark(gx, gy):
+            self.refresh_cells([(gx, gy)])
+        else:
             return
-        cell.marked = not cell.marked
         self.save()
 
-        assert self.parent
-        self.parent.refresh()
-
-    def check_subgrid_solved(self, sg_coord: GridPos) -> None:
+    def get_cell_glyph(self, gx: int, gy: int) -> CellGlyph:
         """
-        Mark a subgrid as solved if the all cells that dont contain a mine have been uncovered.
-
-        Args:
-            sg_coord (GridPos): The coordinates of the subgrid
-        """
-        subgrid: SubGrid = self.subgrids[sg_coord]
-        if subgrid.solved:
-            return
-        for row in subgrid.cells:
-            for cell in row:
-                if not cell.is_mine and not cell.uncovered:
-                    return
-        subgrid.solved = True
-        self.num_solved += 1
-        for row in subgrid.cells:
-            for cell in row:
-                if cell.is_mine and not cell.marked:
-                    cell.marked = True
-
-    def get_cell_representation(self, gx: int, gy: int) -> str:
-        """
-        Return a string representation of the cell at global coordinates (gx, gy).
+        Return how to draw the cell at global coordinates (gx, gy).
 
         Args:
             gx (int): The global x-coordinate of the cell
             gy (int): The global y-coordinate of the cell
 
         Returns:
-            str: The string representation of the cell
+            CellGlyph: The two cell wide text, foreground color and background color of the cell
         """
-        cell: Cell | None = self.global_to_cell(gx, gy)
-
         # set background based on checker pattern
-        sg_coord: GridPos = (gx // 8, gy // 8)
+        sg_coord: GridPos = (gx >> 3, gy >> 3)
+        subgrid: SubGrid | None = self.get_subgrid(sg_coord)
         bg_color = "#000000" if (sg_coord[0] + sg_coord[1]) % 2 == 0 else "#111111"
         if self.mouse_sg_coord == sg_coord and self.highlighted_subgrid:
             bg_color = "#888800"
 
-        if not cell:
-            return f"[#C0C0C0 on {bg_color}]? [/]"  # placeholder for not-yet generated subgrid
-
-        if self.xray or cell.uncovered:
-            if cell.is_mine:
-                if self.xray and cell.marked:
-                    return f"[#FF0000 on {bg_color}]⚑ [/]"
-                return f"[#FF0000 on {bg_color}]💣[/]"
-            count: tuple[int, int] = self.count_adjacent_flags_mines(gx, gy)
-            if cell.parent.solved:
+        if not subgrid:
+            return "? ", "#C0C0C0", bg_color  # placeholder for not-yet generated subgrid
+
+        bit: int = 1 << cell_index(gx & 7, gy & 7)
+        if self.xray or subgrid.uncovered & bit:
+            if subgrid.mines & bit:
+                if self.xray and subgrid.marked & bit:
+                    return "⚑ ", "#FF0000", bg_color
+                return "💣", "#FF0000", bg_color
+            self.load_cell_neighbors(gx, gy)
+            count: int = subgrid.counts[cell_index(gx & 7, gy & 7)]
+            if subgrid.solved:
                 color = "#A0A0A0"
             else:
-                color = "#FFFF00" if cell.highlighted else count_to_color.get(count[1], "#FFFFFF")
-            if cell.parent.solved:
-                if count[1] == 0:
-                    return f"[{color} on {bg_color}]. [/]"
-            if count[1] > 0:
-                return f"[{color} on {bg_color}]{count[1]} [/]"
-            return f"[#C0C0C0 on {bg_color}]  [/]"
+                color = "#FFFF00" if subgrid.highlighted & bit else count_to_color.get(count, "#FFFFFF")
+            if subgrid.solved:
+                if count == 0:
+                    return ". ", color, bg_color
+            if count > 0:
+                return f"{count} ", color, bg_color
+            return "  ", "#C0C0C0", bg_color
         else:
-            if cell.marked:
-                return f"[#FF0000 on {bg_color}]⚑ [/]"
-            color = "#FFFF00" if cell.highlighted else "#E0E0E0"
-            return f"[{color} on {bg_color}]■ [/]"
+            if subgrid.marked & bit:
+                return "⚑ ", "#FF0000", bg_color
+            color = "#FFFF00" if subgrid.highlighted & bit else "#E0E0E0"
+            return "■ ", color, bg_color
+
+    def get_subgrid_glyph(self, sx: int, sy: int) -> CellGlyph:
+        """
+        Return how to draw the subgrid at (sx, sy) as a single character in the subgrid zoom level.
+        Uses only the summary state of the subgrid and never loads it.
+
+        Args:
+            sx (int): The x-coordinate of the subgrid
+            sy (int): The y-coordinate of the subgrid
+
+        Returns:
+            CellGlyph: The character, foreground color and background color of the subgrid
+        """
+        bg_color = "#000000" if (sx + sy) % 2 == 0 else "#111111"
+        subgrid: SubGrid | None = self.subgrids.get((sx, sy))
+        if subgrid is None:
+            if (sx, sy) in self.pending_subgrids:
+                return "?", "#C0C0C0", bg_color
+            return " ", "#C0C0C0", bg_color
+        if subgrid.uncovered & subgrid.mines:
+            return "X", "#FF0000", bg_color
+        if subgrid.solved:
+            return OVERVIEW_SHADES[-1], "#A0A0A0", bg_color
+        # Covered subgrids get the lightest shade, partly uncovered ones one of the three in between
+        num_uncovered: int = subgrid.uncovered.bit_count()
+        shade: int = 0 if not num_uncovered else 1 + min(num_uncovered * 3 // 64, 2)
+        return OVERVIEW_SHADES[shade], "#E0E0E0", bg_color
+
+    def get_block_glyph(self, bx: int, by: int) -> CellGlyph:
+        """
+        Return how to draw the block of subgrids at (bx, by) as a single character in the block zoom level.
+        Uses only the running block summaries kept by the board.
+
+        Args:
+            bx (int): The x-coordinate of the block, in units of BLOCK_SIZE subgrids
+            by (int): The y-coordinate of the block, in units of BLOCK_SIZE subgrids
+
+        Returns:
+            CellGlyph: The character, foreground color and background color of the block
+        """
+        bg_color = "#000000" if (bx + by) % 2 == 0 else "#111111"
+        block: BlockSummary | None = self.blocks.get((bx, by))
+        if block is None:
+            return " ", "#C0C0C0", bg_color
+        shade: int = min(
+            block.num_subgrids * len(OVERVIEW_SHADES) // (BLOCK_SIZE * BLOCK_SIZE), len(OVERVIEW_SHADES) - 1
+        )
+        color = "#A0A0A0" if block.num_solved == block.num_subgrids else "#E0E0E0"
+        return OVERVIEW_SHADES[shade], color, bg_color
+
+    def get_cell_representation(self, gx: int, gy: int) -> str:
+        """
+        Return a markup string representation of the cell at global coordinates (gx, gy).
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            str: The string representation of the cell
+        """
+        text, color, bg_color = self.get_cell_glyph(gx, gy)
+        return f"[{color} on {bg_color}]{text}[/]"
 
     def post_internet_score(self) -> PostScoreResult:
         """
@@ -1,6 +1,9 @@
 import base64
 import os
+import random
 import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from sqlite3 import Connection, Cursor
 from typing import Any
@@ -9,7 +12,14 @@ import requests
 from xdg_base_dirs import xdg_data_home
 
 from par_infini_sweeper import __application_binary__
-from par_infini_sweeper.db_migrations import migrate_db_to_1_1, migrate_legacy_db
+from par_infini_sweeper.db_migrations import (
+    migrate_db_to_1_1,
+    migrate_db_to_1_2,
+    migrate_db_to_1_3,
+    migrate_db_to_1_4,
+    migrate_db_to_1_5,
+    migrate_legacy_db,
+)
 from par_infini_sweeper.enums import GameDifficulty, GameMode
 from par_infini_sweeper.models import (
     ScoreData,
@@ -17,7 +27,7 @@ from par_infini_sweeper.models import (
 )
 
 db_folder_old = Path(f"~/.{__application_binary__}").expanduser()
-db_folder = xdg_data_home() / __application_binary__
+db_folder: Path = xdg_data_home() / __application_binary__
 
 if not db_folder.parent.exists():
     db_folder.parent.mkdir(parents=True, exist_ok=True)
@@ -27,29 +37,63 @@ if db_folder_old.exists() and not db_folder.exists():
     db_folder = db_folder_old.rename(db_folder)
 
 
-db_path = db_folder / "game_data.sqlite"
-db_bak_path = db_folder / "game_data.sqlite.bak"
+db_path: Path = db_folder / "game_data.sqlite"
+db_bak_path: Path = db_folder / "game_data.sqlite.bak"
 
 
-def get_db_connection() -> sqlite3.Connection:
+# Each thread keeps its own long-lived connection so sqlite's prepared statement cache is reused.
+_local = threading.local()
+
+
+def open_db_connection() -> sqlite3.Connection:
     """
-    Return a connection to the SQLite database with a 5 sec timeout.
-    Also creates a backup of the database if it doesn't exist or if it's older than 1 day.
+    Open a new connection to the SQLite database with a 5 sec timeout.
+    Uses WAL journaling so readers on other threads do not block writers, and relaxes syncing to once per checkpoint.
     """
-    db_folder.mkdir(parents=True, exist_ok=True)
-    if db_path.exists():
-        if not db_bak_path.exists():
-            db_bak_path.write_bytes(db_path.read_bytes())
-        else:
-            # if backup is older than 1 day, replace it with the current db
-            if db_bak_path.stat().st_mtime < (db_path.stat().st_mtime - 86400):
-                db_bak_path.write_bytes(db_path.read_bytes())
-
-    conn = sqlite3.connect(db_path, timeout=5)
+    conn = sqlite3.connect(db_path, timeout=5, cached_statements=256)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA cache_size = -8192")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+def get_db_connection() -> sqlite3.Connection:
+    """
+    Return the calling thread's connection to the SQLite database, opening it on first use.
+    The connection stays open until close_db_connection is called from the same thread.
+    """
+    conn: sqlite3.Connection | None = getattr(_local, "conn", None)
+    if conn is None:
+        db_folder.mkdir(parents=True, exist_ok=True)
+        conn = open_db_connection()
+        _local.conn = conn
     return conn
 
 
+def close_db_connection() -> None:
+    """Close the calling thread's connection if it has one."""
+    conn: sqlite3.Connection | None = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.conn = None
+        conn.close()
+
+
+def set_db_folder(folder: Path) -> None:
+    """
+    Use the database in another folder from now on. Closes the calling thread's connection.
+
+    Args:
+        folder (Path): Folder containing game_data.sqlite, created on first use.
+    """
+    global db_folder, db_path, db_bak_path
+    close_db_connection()
+    db_folder = folder
+    db_path = db_folder / "game_data.sqlite"
+    db_bak_path = db_folder / "game_data.sqlite.bak"
+
+
 def init_db(conn: Connection, username: str = "user", nickname: str | None = None) -> None:
     """
     Initialize the SQLite database with required tables and default user.
@@ -117,6 +161,8 @@ def init_db(conn: Connection, username: str = "user", nickname: str | None = Non
                 game_over BOOLEAN NOT NULL DEFAULT 0,
                 duration INTEGER NOT NULL DEFAULT 0,
                 board_offset TEXT NOT NULL DEFAULT '0,0',
+                seed INTEGER NOT NULL DEFAULT 0,
+                snapshot_seq INTEGER NOT NULL DEFAULT 0,
                 created_ts TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
             )
@@ -137,7 +183,9 @@ def init_db(conn: Connection, username: str = "user", nickname: str | None = Non
                 game_id INTEGER NOT NULL,
                 user_id INTEGER NOT NULL,
                 sub_grid_id TEXT NOT NULL,
-                grid_data TEXT NOT NULL,
+                grid_data BLOB NOT NULL,
+                sx INTEGER NOT NULL DEFAULT 0,
+                sy INTEGER NOT NULL DEFAULT 0,
                 FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
                 FOREIGN KEY(game_id) REFERENCES games(id) ON DELETE CASCADE,
                 PRIMARY KEY (game_id, user_id, sub_grid_id)
@@ -158,6 +206,18 @@ def init_db(conn: Connection, username: str = "user", nickname: str | None = Non
         if db_version == "1.0":
             migrate_db_to_1_1(conn)
             db_version = "1.1"
+        if db_version == "1.1":
+            migrate_db_to_1_2(conn)
+            db_version = "1.2"
+        if db_version == "1.2":
+            migrate_db_to_1_3(conn)
+            db_version = "1.3"
+        if db_version == "1.3":
+            migrate_db_to_1_4(conn)
+            db_version = "1.4"
+        if db_version == "1.4":
+            migrate_db_to_1_5(conn)
+            db_version = "1.5"
 
         # Create default user "user" if not exists.
         cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
@@ -169,7 +229,7 @@ def init_db(conn: Connection, username: str = "user", nickname: str | None = Non
             cursor.execute(
                 "INSERT INTO user_prefs (id, theme, difficulty) VALUES (?,?,?)", (user_id, "textual-dark", "easy")
             )
-            cursor.execute("INSERT INTO games (user_id) VALUES (?)", (user_id,))
+            cursor.execute("INSERT INTO games (user_id, seed) VALUES (?, ?)", (user_id, random.getrandbits(63)))
 
 
 def get_user(conn: Connection, username: str = "user", nickname: str | None = None) -> dict[str, Any]:
@@ -220,6 +280,125 @@ def get_user(conn: Connection, username: str = "user", nickname: str | None = No
     return user
 
 
+def get_subgrid_positions(conn: Connection, game_id: int, user_id: int) -> list[tuple[int, int]]:
+    """
+    Return the coordinates of every saved subgrid of a game.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        game_id (int): Id of the game.
+        user_id (int): Id of the user.
+
+    Returns:
+        list[tuple[int, int]]: Subgrid coordinates.
+    """
+    cursor: Cursor = conn.execute("SELECT sx, sy FROM grids WHERE game_id = ? AND user_id = ?", (game_id, user_id))
+    return [(row[0], row[1]) for row in cursor]
+
+
+def get_subgrids_in_rect(
+    conn: Connection, game_id: int, user_id: int, x0: int, y0: int, x1: int, y1: int
+) -> list[sqlite3.Row]:
+    """
+    Return the saved subgrids of a game whose coordinates fall inside a rectangle.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        game_id (int): Id of the game.
+        user_id (int): Id of the user.
+        x0 (int): Minimum subgrid x coordinate, inclusive.
+        y0 (int): Minimum subgrid y coordinate, inclusive.
+        x1 (int): Maximum subgrid x coordinate, inclusive.
+        y1 (int): Maximum subgrid y coordinate, inclusive.
+
+    Returns:
+        list[sqlite3.Row]: Rows with sx, sy and grid_data columns.
+    """
+    cursor: Cursor = conn.execute(
+        """SELECT sx, sy, grid_data FROM grids
+        WHERE game_id = ? AND user_id = ? AND sx BETWEEN ? AND ? AND sy BETWEEN ? AND ?""",
+        (game_id, user_id, x0, x1, y0, y1),
+    )
+    return cursor.fetchall()
+
+
+def get_subgrids_at(
+    conn: Connection, game_id: int, user_id: int, positions: Iterable[tuple[int, int]]
+) -> list[sqlite3.Row]:
+    """
+    Return the saved subgrids of a game at the given coordinates. Coordinates with no saved subgrid are skipped.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        game_id (int): Id of the game.
+        user_id (int): Id of the user.
+        positions (Iterable[tuple[int, int]]): Subgrid coordinates.
+
+    Returns:
+        list[sqlite3.Row]: Rows with sx, sy and grid_data columns.
+    """
+    keys: list[str] = [f"{x},{y}" for x, y in positions]
+    rows: list[sqlite3.Row] = []
+    # Stay well below SQLite's limit on the number of bound parameters.
+    for start in range(0, len(keys), 500):
+        chunk: list[str] = keys[start : start + 500]
+        cursor: Cursor = conn.execute(
+            f"""SELECT sx, sy, grid_data FROM grids
+            WHERE game_id = ? AND user_id = ? AND sub_grid_id IN ({",".join("?" * len(chunk))})""",
+            (game_id, user_id, *chunk),
+        )
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+def iter_subgrids(conn: Connection, game_id: int, user_id: int) -> Iterator[sqlite3.Row]:
+    """
+    Iterate over all saved subgrids of a game without loading them into memory at once.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        game_id (int): Id of the game.
+        user_id (int): Id of the user.
+
+    Returns:
+        Iterator[sqlite3.Row]: Rows with sx, sy and grid_data columns.
+    """
+    return conn.execute("SELECT sx, sy, grid_data FROM grids WHERE game_id = ? AND user_id = ?", (game_id, user_id))
+
+
+def get_moves(conn: Connection, game_id: int, user_id: int, after_seq: int = 0) -> list[sqlite3.Row]:
+    """
+    Return the logged moves of a game in the order they were made.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        game_id (int): Id of the game.
+        user_id (int): Id of the user.
+        after_seq (int): Only return moves with a higher sequence number.
+
+    Returns:
+        list[sqlite3.Row]: Rows with seq, kind, gx, gy and created_ts columns.
+    """
+    cursor: Cursor = conn.execute(
+        "SELECT seq, kind, gx, gy, created_ts FROM moves WHERE game_id = ? AND user_id = ? AND seq > ? ORDER BY seq",
+        (game_id, user_id, after_seq),
+    )
+    return cursor.fetchall()
+
+
+def get_last_move_seq(conn: Connection, game_id: int, user_id: int) -> int:
+    """
+    Return the sequence number of the last logged move of a game, or 0 if there are none.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        game_id (int): Id of the game.
+        user_id (int): Id of the user.
+    """
+    cursor: Cursor = conn.execute("SELECT max(seq) FROM moves WHERE game_id = ? AND user_id = ?", (game_id, user_id))
+    return cursor.fetchone()[0] or 0
+
+
 def get_highscores(num_scores: int = 10) -> dict[GameMode, list[dict[str, Any]]]:
     """
     Return top num_scores highscores for each mode.
@@ -1,5 +1,9 @@
 from sqlite3 import Connection
 
+import orjson
+
+from par_infini_sweeper.grid_codec import encode_grid_data, grid_data_from_dict
+
 
 def migrate_db_to_1_1(conn: Connection) -> None:
     """
@@ -47,6 +51,105 @@ def migrate_db_to_1_1(conn: Connection) -> None:
         cursor.execute("UPDATE pim_db_info set version = ?", ("1.1",))
 
 
+def migrate_db_to_1_2(conn: Connection) -> None:
+    """
+    Migrate the SQLite database from version 1.1 to 1.2.
+    Adds a per-game seed used to derive subgrid mine layouts.
+
+    Args:
+        conn (Connection): SQLite connection object.
+    """
+    with conn:
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(games)")
+        columns = [col[1] for col in cursor.fetchall()]
+        if "seed" not in columns:
+            cursor.execute("ALTER TABLE games ADD COLUMN seed INTEGER NOT NULL DEFAULT 0")
+            cursor.execute("UPDATE games SET seed = random() & 9223372036854775807")
+
+        cursor.execute("UPDATE pim_db_info set version = ?", ("1.2",))
+
+
+def migrate_db_to_1_3(conn: Connection) -> None:
+    """
+    Migrate the SQLite database from version 1.2 to 1.3.
+    Adds integer subgrid coordinates to grids with an index so subgrids can be queried by area.
+
+    Args:
+        conn (Connection): SQLite connection object.
+    """
+    with conn:
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(grids)")
+        columns = [col[1] for col in cursor.fetchall()]
+        if "sx" not in columns:
+            cursor.execute("ALTER TABLE grids ADD COLUMN sx INTEGER NOT NULL DEFAULT 0")
+            cursor.execute("ALTER TABLE grids ADD COLUMN sy INTEGER NOT NULL DEFAULT 0")
+            cursor.execute("""
+                UPDATE grids SET
+                    sx = CAST(substr(sub_grid_id, 1, instr(sub_grid_id, ',') - 1) AS INTEGER),
+                    sy = CAST(substr(sub_grid_id, instr(sub_grid_id, ',') + 1) AS INTEGER)
+            """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS grids_pos_idx ON grids (game_id, user_id, sx, sy)")
+
+        cursor.execute("UPDATE pim_db_info set version = ?", ("1.3",))
+
+
+def migrate_db_to_1_4(conn: Connection) -> None:
+    """
+    Migrate the SQLite database from version 1.3 to 1.4.
+    Converts JSON grid_data to the binary format. SQLite keeps BLOB values as is in the existing TEXT column.
+
+    Args:
+        conn (Connection): SQLite connection object.
+    """
+    with conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT rowid, grid_data FROM grids WHERE typeof(grid_data) = 'text'")
+        cursor.executemany(
+            "UPDATE grids SET grid_data = ? WHERE rowid = ?",
+            [(encode_grid_data(grid_data_from_dict(orjson.loads(row[1]))), row[0]) for row in cursor.fetchall()],
+        )
+
+        cursor.execute("UPDATE pim_db_info set version = ?", ("1.4",))
+
+
+def migrate_db_to_1_5(conn: Connection) -> None:
+    """
+    Migrate the SQLite database from version 1.4 to 1.5.
+    Adds the moves log and the sequence number of the last move included in the grids snapshot.
+
+    Args:
+        conn (Connection): SQLite connection object.
+    """
+    with conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS moves (
+                game_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                kind TEXT NOT NULL CHECK(kind IN ('reveal','mark','chord')),
+                gx INTEGER NOT NULL,
+                gy INTEGER NOT NULL,
+                created_ts REAL NOT NULL,
+                FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
+                FOREIGN KEY(game_id) REFERENCES games(id) ON DELETE CASCADE,
+                PRIMARY KEY (game_id, user_id, seq)
+            )
+        """)
+        cursor.execute("PRAGMA table_info(games)")
+        columns = [col[1] for col in cursor.fetchall()]
+        if "snapshot_seq" not in columns:
+            cursor.execute("ALTER TABLE games ADD COLUMN snapshot_seq INTEGER NOT NULL DEFAULT 0")
+
+        cursor.execute("UPDATE pim_db_info set version = ?", ("1.5",))
+
+
 def migrate_legacy_db(conn: Connection) -> None:
     """
     Migrate the SQLite database to the current schema.
@@ -0,0 +1,1339 @@
+"""Headless board engine for Par Infinite Minesweeper. Has no dependency on Textual or the database."""
+
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Iterable, Iterator, KeysView
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+from par_infini_sweeper.enums import GameDifficulty
+from par_infini_sweeper.grid_codec import GridData, grid_data_from_dict
+
+GridPos = tuple[int, int]
+
+mine_counts: dict[GameDifficulty, int] = {GameDifficulty.EASY: 8, GameDifficulty.MEDIUM: 12, GameDifficulty.HARD: 16}
+difficulty_mult: dict[GameDifficulty, int] = {GameDifficulty.EASY: 1, GameDifficulty.MEDIUM: 2, GameDifficulty.HARD: 3}
+
+# Bitmask with all 64 cells of a subgrid set
+FULL_MASK: int = (1 << 64) - 1
+
+# Cells of a subgrid bitmask outside its first and last column, for shifting cells sideways without wrapping rows
+FIRST_COLUMN: int = 0x0101010101010101
+LAST_COLUMN: int = FIRST_COLUMN << 7
+NOT_FIRST_COLUMN: int = FULL_MASK & ~FIRST_COLUMN
+NOT_LAST_COLUMN: int = FULL_MASK & ~LAST_COLUMN
+
+# (subgrid dx, subgrid dy, corner bit of that subgrid, bit of the corner cell here it touches)
+CORNER_BITS: tuple[tuple[int, int, int, int], ...] = (
+    (-1, -1, 1 << 63, 1),
+    (1, -1, 1 << 56, 1 << 7),
+    (-1, 1, 1 << 7, 1 << 56),
+    (1, 1, 1, 1 << 63),
+)
+
+# Subgrids along each side of the blocks the board keeps running summaries for
+BLOCK_SIZE: int = 8
+
+# Subgrids along each side of the tiles of the downsampled summary rasters, finest first
+RASTER_TILES: tuple[int, ...] = (4, 16, 64, 256, 1024, 4096, 16384)
+
+
+def cell_index(x: int, y: int) -> int:
+    """Return the bit index of local cell (x, y) within a subgrid bitmask."""
+    return (y << 3) | x
+
+
+def _build_neighbor_masks() -> list[tuple[tuple[int, int, int], ...]]:
+    """
+    Build a table mapping each local cell index to the bitmasks of its eight neighbors.
+
+    Neighbors of edge cells fall into adjacent subgrids, so each entry is a tuple of
+    (subgrid dx, subgrid dy, neighbor mask) with at most four items.
+    """
+    table: list[tuple[tuple[int, int, int], ...]] = []
+    for idx in range(64):
+        lx, ly = idx & 7, idx >> 3
+        groups: dict[GridPos, int] = {}
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                nx: int = lx + dx
+                ny: int = ly + dy
+                key: GridPos = (nx >> 3, ny >> 3)
+                groups[key] = groups.get(key, 0) | (1 << cell_index(nx & 7, ny & 7))
+        table.append(tuple((k[0], k[1], m) for k, m in groups.items()))
+    return table
+
+
+NEIGHBOR_MASKS: list[tuple[tuple[int, int, int], ...]] = _build_neighbor_masks()
+
+# For each local cell index, the (subgrid dx, subgrid dy, neighbor index) of its eight neighbors
+NEIGHBOR_CELLS: list[tuple[tuple[int, int, int], ...]] = [
+    tuple((dsx, dsy, nidx) for dsx, dsy, mask in NEIGHBOR_MASKS[idx] for nidx in range(64) if mask >> nidx & 1)
+    for idx in range(64)
+]
+
+
+def _build_border_masks() -> dict[GridPos, int]:
+    """Build a map from neighbor subgrid offset to the mask of its cells that touch the subgrid at (0, 0)."""
+    borders: dict[GridPos, int] = {}
+    for idx in range(64):
+        for dsx, dsy, mask in NEIGHBOR_MASKS[idx]:
+            if dsx or dsy:
+                borders[(dsx, dsy)] = borders.get((dsx, dsy), 0) | mask
+    return borders
+
+
+BORDER_MASKS: dict[GridPos, int] = _build_border_masks()
+
+
+def spread_row(mask: int) -> int:
+    """Return mask with the cells to the left and right of each of its cells added."""
+    return mask | ((mask << 1) & NOT_FIRST_COLUMN) | ((mask >> 1) & NOT_LAST_COLUMN)
+
+
+def spread_column(mask: int) -> int:
+    """Return mask with the cells above and below each of its cells added."""
+    return (mask | (mask << 8) | (mask >> 8)) & FULL_MASK
+
+
+def new_seed() -> int:
+    """Return a random seed for a new game's board layout."""
+    return random.getrandbits(63)
+
+
+def _splitmix64(state: int) -> tuple[int, int]:
+    """Advance a splitmix64 generator, returning the new state and the next 64-bit output."""
+    state = (state + 0x9E3779B97F4A7C15) & FULL_MASK
+    z: int = state
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & FULL_MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & FULL_MASK
+    return state, z ^ (z >> 31)
+
+
+def subgrid_layout(seed: int, pos: GridPos, num_mines: int) -> int:
+    """
+    Derive the mine bitmask of the subgrid at pos from the game seed.
+    The same seed, position and mine count always produce the same layout.
+
+    Args:
+        seed (int): The game seed
+        pos (GridPos): The subgrid coordinates
+        num_mines (int): Number of mines to place
+
+    Returns:
+        int: Bitmask of mine positions
+    """
+    state: int = (
+        seed * 0x9E3779B97F4A7C15
+        ^ (pos[0] & FULL_MASK) * 0xC2B2AE3D27D4EB4F
+        ^ (pos[1] & FULL_MASK) * 0x165667B19E3779F9
+    ) & FULL_MASK
+    mines: int = 0
+    placed: int = 0
+    while placed < num_mines:
+        state, z = _splitmix64(state)
+        bit: int = 1 << (z >> 58)
+        if not mines & bit:
+            mines |= bit
+            placed += 1
+    return mines
+
+
+def subgrid_layouts(seed: int, positions: Iterable[GridPos], num_mines: int) -> Iterator[int]:
+    """
+    Derive the mine bitmasks of many subgrids at once. Yields the same layouts as subgrid_layout
+    with the generator inlined to avoid per-call overhead during bulk generation.
+
+    Args:
+        seed (int): The game seed
+        positions (Iterable[GridPos]): The subgrid coordinates
+        num_mines (int): Number of mines to place in each subgrid
+
+    Returns:
+        Iterator[int]: Bitmask of mine positions for each position in order
+    """
+    seed_mix: int = seed * 0x9E3779B97F4A7C15
+    for sx, sy in positions:
+        state: int = (
+            seed_mix ^ (sx & FULL_MASK) * 0xC2B2AE3D27D4EB4F ^ (sy & FULL_MASK) * 0x165667B19E3779F9
+        ) & FULL_MASK
+        mines: int = 0
+        placed: int = 0
+        while placed < num_mines:
+            state = (state + 0x9E3779B97F4A7C15) & FULL_MASK
+            z: int = ((state ^ (state >> 30)) * 0xBF58476D1CE4E5B9) & FULL_MASK
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & FULL_MASK
+            bit: int = 1 << ((z ^ (z >> 31)) >> 58)
+            if not mines & bit:
+                mines |= bit
+                placed += 1
+        yield mines
+
+
+def ring_positions(x: int, y: int, radius: int) -> Iterator[GridPos]:
+    """Yield the positions on the square ring `radius` steps around (x, y), or (x, y) itself for radius 0."""
+    if not radius:
+        yield x, y
+        return
+    for dx in range(-radius, radius + 1):
+        yield x + dx, y - radius
+        yield x + dx, y + radius
+    for dy in range(-radius + 1, radius):
+        yield x - radius, y + dy
+        yield x + radius, y + dy
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the index of each set bit in mask, lowest first."""
+    while mask:
+        low: int = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BlockSummary:
+    """Running totals for a BLOCK_SIZE × BLOCK_SIZE block of subgrids, kept up to date by the Board."""
+
+    __slots__ = ("num_subgrids", "num_solved", "num_uncovered")
+
+    def __init__(self) -> None:
+        self.num_subgrids: int = 0
+        self.num_solved: int = 0
+        self.num_uncovered: int = 0
+
+
+class SummaryRaster:
+    """
+    Downsampled map of the board counting the subgrids and solved subgrids in each tile of
+    `tile` × `tile` subgrids, kept up to date by the Board so the whole board can be drawn
+    without visiting every subgrid.
+    """
+
+    __slots__ = ("tile", "subgrids", "solved")
+
+    def __init__(self, tile: int) -> None:
+        self.tile: int = tile
+        # Counts keyed by (sx // tile, sy // tile), tiles without any are left out
+        self.subgrids: dict[GridPos, int] = {}
+        self.solved: dict[GridPos, int] = {}
+
+    def update(self, sg_coord: GridPos, num_subgrids: int, num_solved: int) -> None:
+        """
+        Add to the counts of the tile containing a subgrid.
+
+        Args:
+            sg_coord (GridPos): The coordinates of the subgrid that changed
+            num_subgrids (int): Change in the number of subgrids
+            num_solved (int): Change in the number of solved subgrids
+        """
+        pos: GridPos = (sg_coord[0] // self.tile, sg_coord[1] // self.tile)
+        for counts, delta in ((self.subgrids, num_subgrids), (self.solved, num_solved)):
+            if not delta:
+                continue
+            count: int = counts.get(pos, 0) + delta
+            if count:
+                counts[pos] = count
+            else:
+                del counts[pos]
+
+
+class Cell:
+    """Lightweight view of a single cell backed by the bitmasks of its subgrid."""
+
+    __slots__ = ("_parent", "_bit", "x", "y")
+
+    def __init__(self, parent: SubGrid, x: int, y: int) -> None:
+        self._parent = parent
+        self._bit: int = 1 << cell_index(x, y)
+        self.x: int = x
+        self.y: int = y
+
+    @property
+    def is_mine(self) -> bool:
+        return bool(self._parent.mines & self._bit)
+
+    @is_mine.setter
+    def is_mine(self, value: bool) -> None:
+        self._parent.set_mine(self._bit, value)
+
+    @property
+    def marked(self) -> bool:
+        return bool(self._parent.marked & self._bit)
+
+    @marked.setter
+    def marked(self, value: bool) -> None:
+        self._parent.set_marked(self._bit, value)
+
+    @property
+    def uncovered(self) -> bool:
+        return bool(self._parent.uncovered & self._bit)
+
+    @uncovered.setter
+    def uncovered(self, value: bool) -> None:
+        self._parent.set_uncovered(self._bit, value)
+
+    @property
+    def highlighted(self) -> bool:
+        return bool(self._parent.highlighted & self._bit)
+
+    @highlighted.setter
+    def highlighted(self, value: bool) -> None:
+        self._parent.set_highlighted(self._bit, value)
+
+    @property
+    def parent(self) -> SubGrid:
+        return self._parent
+
+    @property
+    def global_pos(self) -> GridPos:
+        """Return the global coordinates of this cell."""
+        return self._parent.pos[0] * 8 + self.x, self._parent.pos[1] * 8 + self.y
+
+    def to_dict(self) -> dict[str, bool]:
+        """Return a dictionary representation of this cell."""
+        return {"is_mine": self.is_mine, "marked": self.marked, "uncovered": self.uncovered}
+
+
+class SubGrid:
+    """
+    Represents an 8×8 subgrid of cells.
+
+    Cell state is stored as 64-bit integer bitmasks where bit ``y * 8 + x`` holds the
+    state of local cell (x, y). Use `cell` to get a `Cell` view when needed.
+    `counts` caches the number of adjacent mines for each cell and is maintained by the parent Board.
+    `safe_remaining` and `num_flags` are running counters kept in step with the bitmasks by the setters.
+    `version` is incremented by `touch` whenever the subgrid is flagged as changed, highlighted or its mine
+    counts change, so views of it can tell when they are stale.
+
+    Mine layouts are derived from the game seed, so a pristine subgrid (no uncovered or marked cells and
+    no relocated mines) can be regenerated at any time and is never written to the database.
+    """
+
+    __slots__ = (
+        "_changed",
+        "_parent",
+        "pos",
+        "mines",
+        "marked",
+        "uncovered",
+        "highlighted",
+        "solved",
+        "counts",
+        "safe_remaining",
+        "num_flags",
+        "layout_modified",
+        "persisted",
+        "version",
+    )
+
+    def __init__(
+        self,
+        parent: Board,
+        pos: GridPos,
+        difficulty: GameDifficulty | None = None,
+    ) -> None:
+        """
+        Initialize a subgrid at position `pos` with the given difficulty.
+
+        Args:
+            parent (Board): The parent board.
+            pos (GridPos): The position of the subgrid.
+            difficulty (GameDifficulty | None): The difficulty level of the game.
+        """
+        self._changed: bool = False
+        self._parent: Board = parent
+        self.pos: GridPos = pos
+        self.mines: int = self.generate_mines(difficulty) if difficulty else 0
+        self.marked: int = 0
+        self.uncovered: int = 0
+        self.highlighted: int = 0
+        self.solved: bool = False
+        self.counts: bytearray = bytearray(64)
+        self.safe_remaining: int = 64 - self.mines.bit_count()
+        self.num_flags: int = 0
+        self.layout_modified: bool = False
+        self.persisted: bool = False
+        self.version: int = 0
+
+    @property
+    def parent(self) -> Board:
+        return self._parent
+
+    @property
+    def changed(self) -> bool:
+        return self._changed
+
+    @changed.setter
+    def changed(self, value: bool) -> None:
+        if value:
+            self.touch()
+        if self._changed != value:
+            self._changed = value
+            if value:
+                self.parent.changed_subgrids.add(self)
+
+    def touch(self) -> None:
+        """Record that the way this subgrid is drawn may have changed."""
+        self.version += 1
+        self._parent.version += 1
+
+    def generate_mines(self, difficulty: GameDifficulty) -> int:
+        """
+        Generate a mine bitmask from the game seed with mines distributed according to difficulty.
+        The number of mines per subgrid is adjusted as follows:
+          - easy: 8 mines
+          - medium: 12 mines
+          - hard: 16 mines
+        """
+
+        return subgrid_layout(self.parent.seed, self.pos, mine_counts.get(difficulty, 8))
+
+    @property
+    def is_pristine(self) -> bool:
+        """Return True if this subgrid still matches its seeded layout and has never been played."""
+        return not (self.uncovered or self.marked or self.layout_modified)
+
+    def cell(self, x: int, y: int) -> Cell:
+        """Return a view of the cell at local coordinate (x, y)."""
+        return Cell(self, x, y)
+
+    def set_mine(self, bit: int, value: bool) -> None:
+        """Set or clear the mine flag for the cell(s) in `bit`."""
+        mines: int = self.mines | bit if value else self.mines & ~bit
+        if mines != self.mines:
+            flipped: int = mines ^ self.mines
+            self.parent.update_mine_counts(self, flipped, 1 if value else -1)
+            covered: int = (flipped & ~self.uncovered).bit_count()
+            self.safe_remaining += -covered if value else covered
+            self.mines = mines
+            self.layout_modified = True
+            self.changed = True
+
+    def set_marked(self, bit: int, value: bool) -> None:
+        """Set or clear the mark flag for the cell(s) in `bit`."""
+        marked: int = self.marked | bit if value else self.marked & ~bit
+        if marked != self.marked:
+            flipped: int = (marked ^ self.marked).bit_count()
+            self.num_flags += flipped if value else -flipped
+            self.marked = marked
+            self.parent.frontier_dirty.add(self.pos)
+            self.changed = True
+
+    def set_uncovered(self, bit: int, value: bool) -> None:
+        """Set or clear the uncovered flag for the cell(s) in `bit`."""
+        uncovered: int = self.uncovered | bit if value else self.uncovered & ~bit
+        if uncovered != self.uncovered:
+            flipped: int = uncovered ^ self.uncovered
+            safe: int = (flipped & ~self.mines).bit_count()
+            self.safe_remaining += -safe if value else safe
+            delta: int = flipped.bit_count() if value else -flipped.bit_count()
+            self.parent.num_uncovered += delta
+            self.parent.update_block(self.pos, 0, 0, delta)
+            self.uncovered = uncovered
+            self.parent.frontier_dirty.add(self.pos)
+            self.changed = True
+
+    def set_highlighted(self, bit: int, value: bool) -> None:
+        """Set or clear the highlight flag for the cell in `bit`. Highlights are not persisted."""
+        if bool(self.highlighted & bit) == value:
+            return
+        idx: int = bit.bit_length() - 1
+        gpos: GridPos = (self.pos[0] * 8 + (idx & 7), self.pos[1] * 8 + (idx >> 3))
+        if value:
+            self.highlighted |= bit
+            self.parent.highlighted_cells.add(gpos)
+        else:
+            self.highlighted &= ~bit
+            self.parent.highlighted_cells.discard(gpos)
+        self.touch()
+
+    @property
+    def all_safe_uncovered(self) -> bool:
+        """Return True if every cell that is not a mine has been uncovered."""
+        return self.safe_remaining == 0
+
+    def recount(self) -> None:
+        """Recompute the running counters from the bitmasks after they were assigned directly."""
+        self.safe_remaining = (FULL_MASK & ~self.mines & ~self.uncovered).bit_count()
+        self.num_flags = self.marked.bit_count()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of this subgrid."""
+        return {
+            "pos": self.pos,
+            "mines": self.mines,
+            "marked": self.marked,
+            "uncovered": self.uncovered,
+            "solved": self.solved,
+            "layout_modified": self.layout_modified,
+        }
+
+    def clear_changed(self) -> None:
+        """Clear the changed flag for the subgrid."""
+        self.changed = False
+
+    @property
+    def key_str(self) -> str:
+        """Return a unique key for this subgrid."""
+        return f"{self.pos[0]},{self.pos[1]}"
+
+    def to_grid_data(self) -> GridData:
+        """Return the persisted state of this subgrid."""
+        return GridData(self.mines, self.marked, self.uncovered, self.solved, self.layout_modified)
+
+    @staticmethod
+    def from_dict(parent: Board, data: dict[str, Any]) -> SubGrid:
+        """
+        Create a SubGrid instance from its dictionary representation.
+        Accepts both the bitmask format and the legacy nested list of cell dicts.
+        """
+        return SubGrid.from_grid_data(parent, tuple(data["pos"]), grid_data_from_dict(data))
+
+    @staticmethod
+    def from_grid_data(parent: Board, pos: GridPos, data: GridData) -> SubGrid:
+        """Create a SubGrid instance from its persisted state."""
+        sg: SubGrid = SubGrid(parent, pos)
+        sg.persisted = True
+        sg.layout_modified = data.layout_modified
+        sg.mines = data.mines
+        sg.marked = data.marked
+        sg.uncovered = data.uncovered
+        sg.recount()
+        sg.solved = data.solved
+        if sg.solved:
+            return sg
+        # Ensure that the subgrid is solved if all non-mine cells are uncovered.
+        if not sg.all_safe_uncovered:
+            return sg
+        sg.solved = True
+        if sg.mines & ~sg.marked:
+            sg.marked |= sg.mines
+            sg.recount()
+            # This may run on the background loader thread, so only flag the subgrid here.
+            # insert_subgrid queues it for saving.
+            sg._changed = True
+
+        return sg
+
+
+@dataclass
+class RevealResult:
+    """Summary of the changes made by revealing one or more cells."""
+
+    cells_revealed: list[GridPos] = field(default_factory=list)
+    subgrids_touched: set[GridPos] = field(default_factory=set)
+    subgrids_created: set[GridPos] = field(default_factory=set)
+    subgrids_solved: list[GridPos] = field(default_factory=list)
+    hit_mine: bool = False
+    blocked: bool = False
+
+    @property
+    def num_revealed(self) -> int:
+        """Return the number of cells uncovered."""
+        return len(self.cells_revealed)
+
+    @property
+    def changed(self) -> bool:
+        """Return True if the board changed."""
+        return bool(self.cells_revealed or self.subgrids_created)
+
+    def merge(self, other: RevealResult) -> None:
+        """Fold the changes recorded in other into this result."""
+        self.cells_revealed.extend(other.cells_revealed)
+        self.subgrids_touched.update(other.subgrids_touched)
+        self.subgrids_created.update(other.subgrids_created)
+        self.subgrids_solved.extend(other.subgrids_solved)
+        self.hit_mine = self.hit_mine or other.hit_mine
+        self.blocked = self.blocked or other.blocked
+
+
+class CellInfo(NamedTuple):
+    """State of a single cell as returned by Board.query."""
+
+    uncovered: bool
+    marked: bool
+    is_mine: bool
+    adjacent_mines: int
+    solved: bool
+
+
+class Board:
+    """
+    The infinite board and its rules. Moves report what they changed through their return values,
+    so a Board can be driven directly from scripts, benchmarks and worker processes.
+
+    Subclasses that keep subgrids outside of `subgrids` (see GameState) override `get_subgrid`,
+    `load_subgrids` and `load_cell_neighbors` to add them on demand.
+    """
+
+    def __init__(self, seed: int, difficulty: GameDifficulty, game_over: bool = False) -> None:
+        """
+        Initialize a board with only the subgrid at the origin.
+
+        Args:
+            seed (int): The game seed the mine layouts are derived from
+            difficulty (GameDifficulty): The difficulty level of the game
+            game_over (bool): Whether a mine has already been hit
+        """
+        self.seed: int = seed
+        self.difficulty: GameDifficulty = difficulty
+        self.subgrids: dict[GridPos, SubGrid] = {}
+        self.changed_subgrids: set[SubGrid] = set()
+        self.highlighted_cells: set[GridPos] = set()
+        self.num_solved: int = 0
+        self.num_uncovered: int = 0
+        # Summaries of the subgrids in each block, keyed by (sx // BLOCK_SIZE, sy // BLOCK_SIZE)
+        self.blocks: dict[GridPos, BlockSummary] = {}
+        # Coarser summaries of the whole board, one for each size in RASTER_TILES
+        self.rasters: list[SummaryRaster] = [SummaryRaster(tile) for tile in RASTER_TILES]
+        # Running sums of the subgrid coordinates and the number of subgrids in each row and column,
+        # so the bounds and centroid of the board never need a pass over every subgrid.
+        # Subclasses can count positions of subgrids that are not on the board yet, see GameState.add_pending.
+        self.num_occupied: int = 0
+        self.sum_x: int = 0
+        self.sum_y: int = 0
+        self.row_occupancy: dict[int, int] = {}
+        self.column_occupancy: dict[int, int] = {}
+        self._bounds: tuple[int, int, int, int] = (0, 0, 0, 0)
+        self._bounds_stale: bool = True
+        # Masks of the covered, unflagged cells next to uncovered cells for each unsolved subgrid that has any,
+        # recomputed for the subgrids in frontier_dirty and their neighbors before each query
+        self._frontier: dict[GridPos, int] = {}
+        self.frontier_dirty: set[GridPos] = set()
+        self.game_over: bool = game_over
+        self.first_click: bool = True
+        # Incremented whenever anything that affects how the board is drawn changes
+        self.version: int = 0
+        self.insert_subgrid(SubGrid(self, (0, 0), self.difficulty))
+
+    def reset(self, seed: int) -> None:
+        """
+        Clear the board for a new game with the given seed.
+
+        Args:
+            seed (int): The game seed the mine layouts are derived from
+        """
+        self.clear_highlighted()
+        self.seed = seed
+        self.subgrids = {}
+        self.changed_subgrids.clear()
+        self.num_solved = 0
+        self.num_uncovered = 0
+        self.blocks = {}
+        self.rasters = [SummaryRaster(tile) for tile in RASTER_TILES]
+        self.num_occupied = 0
+        self.sum_x = 0
+        self.sum_y = 0
+        self.row_occupancy = {}
+        self.column_occupancy = {}
+        self._bounds_stale = True
+        self._frontier = {}
+        self.frontier_dirty = set()
+        self.game_over = False
+        self.first_click = True
+        self.insert_subgrid(SubGrid(self, (0, 0), self.difficulty))
+
+    @property
+    def bounds(self) -> tuple[int, int, int, int]:
+        """Return the (min x, min y, max x, max y) coordinates of the subgrids on the board and any still loading."""
+        if self._bounds_stale:
+            # Only after a reset or when a subgrid on the edge was replaced
+            self._bounds_stale = False
+            self._bounds = (
+                min(self.column_occupancy, default=0),
+                min(self.row_occupancy, default=0),
+                max(self.column_occupancy, default=0),
+                max(self.row_occupancy, default=0),
+            )
+        return self._bounds
+
+    @property
+    def centroid(self) -> GridPos:
+        """Return the global cell coordinates of the top left cell of the average subgrid position."""
+        count: int = max(self.num_occupied, 1)
+        return self.sum_x * 8 // count, self.sum_y * 8 // count
+
+    def update_occupancy(self, sg_coord: GridPos, delta: int) -> None:
+        """
+        Add a subgrid to or remove it from the running coordinate sums, row and column counts and bounds.
+
+        Args:
+            sg_coord (GridPos): The coordinates of the subgrid
+            delta (int): 1 if the subgrid was added, -1 if it was removed
+        """
+        sx, sy = sg_coord
+        self.num_occupied += delta
+        self.sum_x += sx * delta
+        self.sum_y += sy * delta
+        for occupancy, key in ((self.column_occupancy, sx), (self.row_occupancy, sy)):
+            count: int = occupancy.get(key, 0) + delta
+            if count:
+                occupancy[key] = count
+            else:
+                del occupancy[key]
+                self._bounds_stale = True
+        if delta > 0 and not self._bounds_stale:
+            x0, y0, x1, y1 = self._bounds
+            self._bounds = (min(x0, sx), min(y0, sy), max(x1, sx), max(y1, sy))
+
+    def score(self) -> int:
+        """Calculate the score based on the number of solved subgrids and difficulty."""
+        return self.num_solved * mine_counts.get(self.difficulty, 8)
+
+    def clear_highlighted(self) -> None:
+        """Clear the highlighted flag for all cells in all subgrids."""
+        for gx, gy in self.highlighted_cells:
+            subgrid: SubGrid | None = self.subgrids.get((gx >> 3, gy >> 3))
+            if subgrid and subgrid.highlighted:
+                subgrid.highlighted = 0
+                subgrid.touch()
+        self.highlighted_cells.clear()
+
+    def clear_changed(self) -> None:
+        """Clear the changed flag for all subgrids."""
+        for sg in list(self.changed_subgrids):
+            sg.clear_changed()
+        self.changed_subgrids.clear()
+
+    def get_subgrid(self, sg_coord: GridPos) -> SubGrid | None:
+        """
+        Return the subgrid at sg_coord.
+
+        Args:
+            sg_coord (GridPos): The coordinates of the subgrid
+
+        Returns:
+            SubGrid | None: The subgrid or None if it does not exist
+        """
+        return self.subgrids.get(sg_coord)
+
+    def load_subgrids(self, positions: set[GridPos]) -> set[GridPos]:
+        """
+        Add any of the missing subgrids at positions that exist outside the board.
+
+        Args:
+            positions (set[GridPos]): Coordinates of subgrids that are not on the board
+
+        Returns:
+            set[GridPos]: The positions that are still missing and need to be generated
+        """
+        return positions
+
+    def load_cell_neighbors(self, gx: int, gy: int) -> None:
+        """
+        Make sure every subgrid touching the cell at (gx, gy) that exists is on the board,
+        so that its cached mine count is complete.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+        """
+
+    def add_subgrid(self, sg_coord: GridPos) -> SubGrid:
+        """
+        Generate a new subgrid at sg_coord and add it to the board.
+
+        Args:
+            sg_coord (GridPos): The coordinates of the subgrid
+
+        Returns:
+            SubGrid: The newly generated subgrid
+        """
+        subgrid: SubGrid = SubGrid(self, sg_coord, self.difficulty)
+        self.insert_subgrid(subgrid)
+        subgrid.changed = True
+        return subgrid
+
+    def insert_subgrid(self, subgrid: SubGrid, counted: bool = False) -> None:
+        """
+        Add a subgrid to the board and bring the adjacent mine counts of it and its neighbors up to date.
+
+        Args:
+            subgrid (SubGrid): The subgrid to add
+            counted (bool): Whether its position is already included in the occupancy
+        """
+        sx, sy = subgrid.pos
+        previous: SubGrid | None = self.subgrids.get(subgrid.pos)
+        if previous is not None:
+            self.remove_subgrid(previous)
+        self.subgrids[subgrid.pos] = subgrid
+        self.version += 1
+        if not counted:
+            self.update_occupancy(subgrid.pos, 1)
+        self.frontier_dirty.add(subgrid.pos)
+        if subgrid.changed:
+            self.changed_subgrids.add(subgrid)
+        self.num_uncovered += subgrid.uncovered.bit_count()
+        if subgrid.solved:
+            self.num_solved += 1
+        self.update_block(subgrid.pos, 1, int(subgrid.solved), subgrid.uncovered.bit_count())
+        counts: bytearray = subgrid.counts
+        # Mines in this subgrid count towards cells here and in any neighbor that already exists.
+        for idx in iter_bits(subgrid.mines):
+            for dsx, dsy, nidx in NEIGHBOR_CELLS[idx]:
+                if not dsx and not dsy:
+                    counts[nidx] += 1
+                    continue
+                neighbor: SubGrid | None = self.subgrids.get((sx + dsx, sy + dsy))
+                if neighbor:
+                    neighbor.counts[nidx] += 1
+                    neighbor.touch()
+        # Mines on the borders of existing neighbors count towards cells here.
+        for (dsx, dsy), border in BORDER_MASKS.items():
+            neighbor = self.subgrids.get((sx + dsx, sy + dsy))
+            if not neighbor:
+                continue
+            for idx in iter_bits(neighbor.mines & border):
+                for ndx, ndy, nidx in NEIGHBOR_CELLS[idx]:
+                    if ndx == -dsx and ndy == -dsy:
+                        counts[nidx] += 1
+
+    def remove_subgrid(self, subgrid: SubGrid) -> None:
+        """
+        Remove a subgrid from the board, withdrawing its contribution to the counters and its neighbors' mine counts.
+
+        Args:
+            subgrid (SubGrid): The subgrid to remove
+        """
+        sx, sy = subgrid.pos
+        for idx in iter_bits(subgrid.mines):
+            for dsx, dsy, nidx in NEIGHBOR_CELLS[idx]:
+                if not dsx and not dsy:
+                    continue
+                neighbor: SubGrid | None = self.subgrids.get((sx + dsx, sy + dsy))
+                if neighbor:
+                    neighbor.counts[nidx] -= 1
+                    neighbor.touch()
+        del self.subgrids[subgrid.pos]
+        self.version += 1
+        self.update_occupancy(subgrid.pos, -1)
+        self.frontier_dirty.add(subgrid.pos)
+        self.num_uncovered -= subgrid.uncovered.bit_count()
+        if subgrid.solved:
+            self.num_solved -= 1
+        self.update_block(subgrid.pos, -1, -int(subgrid.solved), -subgrid.uncovered.bit_count())
+        self.changed_subgrids.discard(subgrid)
+        subgrid.counts = bytearray(64)
+
+    def update_block(self, sg_coord: GridPos, num_subgrids: int, num_solved: int, num_uncovered: int) -> None:
+        """
+        Add to the running totals of the block containing a subgrid and to the summary rasters.
+
+        Args:
+            sg_coord (GridPos): The coordinates of the subgrid that changed
+            num_subgrids (int): Change in the number of subgrids
+            num_solved (int): Change in the number of solved subgrids
+            num_uncovered (int): Change in the number of uncovered cells
+        """
+        block_pos: GridPos = (sg_coord[0] // BLOCK_SIZE, sg_coord[1] // BLOCK_SIZE)
+        block: BlockSummary | None = self.blocks.get(block_pos)
+        if block is None:
+            block = self.blocks[block_pos] = BlockSummary()
+        block.num_subgrids += num_subgrids
+        block.num_solved += num_solved
+        block.num_uncovered += num_uncovered
+        if not block.num_subgrids:
+            del self.blocks[block_pos]
+        if num_subgrids or num_solved:
+            for raster in self.rasters:
+                raster.update(sg_coord, num_subgrids, num_solved)
+
+    def update_mine_counts(self, subgrid: SubGrid, bits: int, delta: int) -> None:
+        """
+        Adjust the cached adjacent mine counts around the cells in `bits` after mines were added or removed.
+
+        Args:
+            subgrid (SubGrid): The subgrid whose mines changed
+            bits (int): Mask of the cells that gained or lost a mine
+            delta (int): 1 if mines were added, -1 if they were removed
+        """
+        if self.subgrids.get(subgrid.pos) is not subgrid:
+            return
+        sx, sy = subgrid.pos
+        for idx in iter_bits(bits):
+            for dsx, dsy, nidx in NEIGHBOR_CELLS[idx]:
+                neighbor: SubGrid | None = subgrid if not dsx and not dsy else self.subgrids.get((sx + dsx, sy + dsy))
+                if neighbor:
+                    neighbor.counts[nidx] += delta
+                    neighbor.touch()
+
+    def global_to_cell(self, gx: int, gy: int, create_if_needed: bool = False) -> Cell | None:
+        """
+        Convert global coordinates to local cell coordinates.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+            create_if_needed (bool): Whether to create the subgrid if it does not exist
+
+        Returns:
+            Cell | None: The cell at the given coordinates, or None if the subgrid does not exist and create_if_needed is False
+        """
+        sg_coord: GridPos = (gx // 8, gy // 8)
+        local_x: int = gx % 8
+        local_y: int = gy % 8
+        subgrid: SubGrid | None = self.get_subgrid(sg_coord)
+        if subgrid is None:
+            if not create_if_needed:
+                return None
+            subgrid = self.add_subgrid(sg_coord)
+        return subgrid.cell(local_x, local_y)
+
+    def cell_has_uncovered_neighbor(self, gx: int, gy: int) -> bool:
+        """
+        Check whether the cell at (gx, gy) has at least one uncovered neighbor.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            bool: True if the cell has at least one uncovered neighbor, False otherwise
+        """
+        sx: int = gx >> 3
+        sy: int = gy >> 3
+        for dsx, dsy, mask in NEIGHBOR_MASKS[cell_index(gx & 7, gy & 7)]:
+            subgrid: SubGrid | None = self.get_subgrid((sx + dsx, sy + dsy))
+            if subgrid and (subgrid.uncovered | subgrid.mines) & mask:
+                return True
+        return False
+
+    def compute_frontier(self, sg_coord: GridPos) -> int:
+        """
+        Compute the mask of the covered, unflagged cells of a subgrid that are next to an uncovered cell.
+
+        Args:
+            sg_coord (GridPos): The coordinates of the subgrid
+
+        Returns:
+            int: The frontier mask, 0 if the subgrid is solved or not on the board
+        """
+        subgrid: SubGrid | None = self.subgrids.get(sg_coord)
+        if subgrid is None or subgrid.solved:
+            return 0
+        sx, sy = sg_coord
+        reach: int = spread_column(spread_row(subgrid.uncovered))
+        # Uncovered cells on the touching edges and corners of the neighbors reach into this subgrid
+        neighbor: SubGrid | None = self.subgrids.get((sx, sy - 1))
+        if neighbor:
+            reach |= spread_row(neighbor.uncovered >> 56)
+        neighbor = self.subgrids.get((sx, sy + 1))
+        if neighbor:
+            reach |= spread_row((neighbor.uncovered & 0xFF) << 56)
+        neighbor = self.subgrids.get((sx - 1, sy))
+        if neighbor:
+            reach |= spread_column((neighbor.uncovered & LAST_COLUMN) >> 7)
+        neighbor = self.subgrids.get((sx + 1, sy))
+        if neighbor:
+            reach |= spread_column((neighbor.uncovered & FIRST_COLUMN) << 7)
+        for dsx, dsy, corner, bit in CORNER_BITS:
+            neighbor = self.subgrids.get((sx + dsx, sy + dsy))
+            if neighbor and neighbor.uncovered & corner:
+                reach |= bit
+        return reach & ~(subgrid.uncovered | subgrid.marked) & FULL_MASK
+
+    def update_frontier(self) -> None:
+        """Recompute the frontier masks of the subgrids changed since the last query and of their neighbors."""
+        if not self.frontier_dirty:
+            return
+        positions: set[GridPos] = {
+            (sx + dsx, sy + dsy) for sx, sy in self.frontier_dirty for dsx in (-1, 0, 1) for dsy in (-1, 0, 1)
+        }
+        self.frontier_dirty.clear()
+        for pos in positions:
+            mask: int = self.compute_frontier(pos)
+            if mask:
+                self._frontier[pos] = mask
+            else:
+                self._frontier.pop(pos, None)
+
+    @property
+    def frontier_subgrids(self) -> KeysView[GridPos]:
+        """Return the coordinates of the unsolved subgrids with covered cells next to uncovered ones."""
+        self.update_frontier()
+        return self._frontier.keys()
+
+    def is_frontier(self, gx: int, gy: int) -> bool:
+        """
+        Check whether the cell at (gx, gy) is covered, not flagged and next to an uncovered cell.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            bool: True if the cell is in the frontier
+        """
+        self.update_frontier()
+        return bool(self._frontier.get((gx >> 3, gy >> 3), 0) >> cell_index(gx & 7, gy & 7) & 1)
+
+    def iter_frontier(self) -> Iterator[GridPos]:
+        """Yield the global coordinates of every frontier cell. The board may be changed while iterating."""
+        self.update_frontier()
+        for (sx, sy), mask in list(self._frontier.items()):
+            for idx in iter_bits(mask):
+                yield sx * 8 + (idx & 7), sy * 8 + (idx >> 3)
+
+    def nearest_frontier(self, gx: int, gy: int) -> GridPos | None:
+        """
+        Find the frontier cell closest to the cell at (gx, gy).
+        Searches rings of subgrids outward from the cell, falling back to checking every frontier subgrid
+        once that would be cheaper.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            GridPos | None: The global coordinates of the closest frontier cell, or None if the frontier is empty
+        """
+        self.update_frontier()
+        if not self._frontier:
+            return None
+        sx: int = gx >> 3
+        sy: int = gy >> 3
+        best: GridPos | None = None
+        best_dist: int = 0
+        # Rings hold about as many subgrids in total as the frontier by the last one searched
+        for radius in range(math.isqrt(len(self._frontier)) // 2 + 1):
+            for pos in ring_positions(sx, sy, radius):
+                best, best_dist = self._closest_in_subgrid(pos, gx, gy, best, best_dist)
+            # Cells in the next ring are more than radius * 8 cells away
+            if best is not None and best_dist <= (radius * 8 + 1) ** 2:
+                return best
+        for pos in self._frontier:
+            # Skip subgrids that are further away than the best cell so far
+            dx: int = max(pos[0] * 8 - gx, gx - pos[0] * 8 - 7, 0)
+            dy: int = max(pos[1] * 8 - gy, gy - pos[1] * 8 - 7, 0)
+            if best is None or dx * dx + dy * dy < best_dist:
+                best, best_dist = self._closest_in_subgrid(pos, gx, gy, best, best_dist)
+        return best
+
+    def _closest_in_subgrid(
+        self, sg_coord: GridPos, gx: int, gy: int, best: GridPos | None, best_dist: int
+    ) -> tuple[GridPos | None, int]:
+        """Return the closer of best and the frontier cells of a subgrid to (gx, gy), with its squared distance."""
+        mask: int = self._frontier.get(sg_coord, 0)
+        for idx in iter_bits(mask):
+            cx: int = sg_coord[0] * 8 + (idx & 7)
+            cy: int = sg_coord[1] * 8 + (idx >> 3)
+            dist: int = (cx - gx) ** 2 + (cy - gy) ** 2
+            if best is None or dist < best_dist:
+                best, best_dist = (cx, cy), dist
+        return best, best_dist
+
+    def count_adjacent_flags_mines(self, gx: int, gy: int) -> tuple[int, int]:
+        """
+        Count the number of flags and mines adjacent to the cell at (gx, gy).
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            tuple[int, int]: A tuple containing the number of flagged cells and the number of mines
+
+        """
+        flag_count: int = 0
+        sx: int = gx >> 3
+        sy: int = gy >> 3
+        idx: int = cell_index(gx & 7, gy & 7)
+        for dsx, dsy, mask in NEIGHBOR_MASKS[idx]:
+            subgrid: SubGrid | None = self.get_subgrid((sx + dsx, sy + dsy))
+            if subgrid is not None:
+                flag_count += (subgrid.marked & mask).bit_count()
+        return flag_count, self.count_adjacent_mines(gx, gy)
+
+    def count_adjacent_mines(self, gx: int, gy: int) -> int:
+        """
+        Return the number of mines adjacent to the cell at (gx, gy) using the per-subgrid count cache.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            int: The number of adjacent mines in subgrids that exist
+        """
+        idx: int = cell_index(gx & 7, gy & 7)
+        self.load_cell_neighbors(gx, gy)
+        subgrid: SubGrid | None = self.get_subgrid((gx >> 3, gy >> 3))
+        if subgrid is not None:
+            return subgrid.counts[idx]
+        # The cell's own subgrid does not exist yet so count directly from the neighbors that do.
+        mine_count: int = 0
+        sx: int = gx >> 3
+        sy: int = gy >> 3
+        for dsx, dsy, mask in NEIGHBOR_MASKS[idx]:
+            neighbor: SubGrid | None = self.get_subgrid((sx + dsx, sy + dsy))
+            if neighbor is not None:
+                mine_count += (neighbor.mines & mask).bit_count()
+        return mine_count
+
+    def query(self, gx: int, gy: int) -> CellInfo | None:
+        """
+        Return the state of the cell at (gx, gy).
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            CellInfo | None: The state of the cell, or None if its subgrid has not been generated
+        """
+        subgrid: SubGrid | None = self.get_subgrid((gx >> 3, gy >> 3))
+        if subgrid is None:
+            return None
+        bit: int = 1 << cell_index(gx & 7, gy & 7)
+        return CellInfo(
+            bool(subgrid.uncovered & bit),
+            bool(subgrid.marked & bit),
+            bool(subgrid.mines & bit),
+            self.count_adjacent_mines(gx, gy),
+            subgrid.solved,
+        )
+
+    def reveal(self, gx: int, gy: int) -> RevealResult:
+        """
+        Reveal the cell at (gx, gy) as a player move.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            RevealResult: Summary of the cells and subgrids that changed
+        """
+        result: RevealResult = self.reveal_cell(gx, gy)
+        if result.changed:
+            self.first_click = False
+        return result
+
+    def reveal_cell(self, gx: int, gy: int) -> RevealResult:
+        """
+        Reveal the cell at global coordinates (gx, gy). If it is a mine the game ends.
+        Cells with no adjacent mines are flood filled iteratively, generating adjacent subgrids as needed.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            RevealResult: Summary of the cells and subgrids that changed
+        """
+        result: RevealResult = RevealResult()
+        if self.game_over:
+            return result
+        sg_coord: GridPos = (gx >> 3, gy >> 3)
+        # For non-initial subgrids, only allow a reveal if at least one neighbor is uncovered.
+        if sg_coord != (0, 0) and not self.cell_has_uncovered_neighbor(gx, gy):
+            result.blocked = True
+            return result
+
+        subgrid: SubGrid | None = self.get_subgrid(sg_coord)
+        if subgrid is None:
+            subgrid = self.add_subgrid(sg_coord)
+            result.subgrids_created.add(sg_coord)
+        bit: int = 1 << cell_index(gx & 7, gy & 7)
+        # Do nothing if cell is marked or uncovered.
+        if (subgrid.marked | subgrid.uncovered) & bit:
+            return result
+
+        subgrid.set_uncovered(bit, True)
+        result.cells_revealed.append((gx, gy))
+        result.subgrids_touched.add(sg_coord)
+        if subgrid.mines & bit:
+            if not self.first_click:
+                result.hit_mine = True
+                self.game_over = True
+                return result
+            subgrid.set_mine(bit, False)
+            self.generate_neighbor_subgrids([(gx, gy)], result)
+            # move mine to a surrounding cell
+            moved_to: GridPos | None = self.relocate_mine(gx, gy)
+            if moved_to:
+                result.subgrids_touched.add((moved_to[0] >> 3, moved_to[1] >> 3))
+
+        self.flood_fill([(gx, gy)], result)
+        for pos in result.subgrids_touched:
+            if self.check_subgrid_solved(pos):
+                result.subgrids_solved.append(pos)
+        return result
+
+    def generate_neighbor_subgrids(self, cells: list[GridPos], result: RevealResult) -> None:
+        """
+        Generate every missing subgrid that borders one of the given cells in a single pass.
+
+        Args:
+            cells (list[GridPos]): Global coordinates of the cells
+            result (RevealResult): Result to record the created subgrids in
+        """
+        missing: set[GridPos] = set()
+        for gx, gy in cells:
+            sx: int = gx >> 3
+            sy: int = gy >> 3
+            for dsx, dsy, _ in NEIGHBOR_MASKS[cell_index(gx & 7, gy & 7)]:
+                n_sg: GridPos = (sx + dsx, sy + dsy)
+                if n_sg not in self.subgrids:
+                    missing.add(n_sg)
+        if missing:
+            missing = self.load_subgrids(missing)
+        for n_sg in missing:
+            self.add_subgrid(n_sg)
+        result.subgrids_created.update(missing)
+
+    def flood_fill(self, start: list[GridPos], result: RevealResult) -> None:
+        """
+        Uncover every cell reachable from the uncovered `start` cells through cells with no adjacent mines.
+        Works in waves so the subgrids bordering each wave are generated in bulk before their counts are read.
+
+        Args:
+            start (list[GridPos]): Global coordinates of already uncovered cells to expand from
+            result (RevealResult): Result to record the revealed cells and touched subgrids in
+        """
+        wave: list[GridPos] = start
+        while wave:
+            self.generate_neighbor_subgrids(wave, result)
+            next_wave: list[GridPos] = []
+            for gx, gy in wave:
+                sx: int = gx >> 3
+                sy: int = gy >> 3
+                idx: int = cell_index(gx & 7, gy & 7)
+                if self.subgrids[(sx, sy)].counts[idx]:
+                    continue
+                for dsx, dsy, nidx in NEIGHBOR_CELLS[idx]:
+                    n_sg: GridPos = (sx + dsx, sy + dsy)
+                    neighbor: SubGrid = self.subgrids[n_sg]
+                    nbit: int = 1 << nidx
+                    if (neighbor.marked | neighbor.uncovered) & nbit:
+                        continue
+                    neighbor.set_uncovered(nbit, True)
+                    pos: GridPos = (n_sg[0] * 8 + (nidx & 7), n_sg[1] * 8 + (nidx >> 3))
+                    result.cells_revealed.append(pos)
+                    result.subgrids_touched.add(n_sg)
+                    next_wave.append(pos)
+            wave = next_wave
+
+    def relocate_mine(self, gx: int, gy: int) -> GridPos | None:
+        """
+        Place a mine on the first neighbor of (gx, gy) that does not already contain one.
+        Used to keep the mine count constant when the first click lands on a mine.
+
+        Args:
+            gx (int): The global x-coordinate of the cell the mine was removed from
+            gy (int): The global y-coordinate of the cell the mine was removed from
+
+        Returns:
+            GridPos | None: The global coordinates of the new mine, or None if every neighbor is a mine
+        """
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                nx: int = gx + dx
+                ny: int = gy + dy
+                n_sg: GridPos = (nx >> 3, ny >> 3)
+                subgrid: SubGrid = self.get_subgrid(n_sg) or self.add_subgrid(n_sg)
+                bit: int = 1 << cell_index(nx & 7, ny & 7)
+                if not subgrid.mines & bit:
+                    subgrid.set_mine(bit, True)
+                    return nx, ny
+        return None
+
+    def chord(self, gx: int, gy: int) -> RevealResult:
+        """
+        Reveal surrounding cells if the cell at (gx, gy) is uncovered and the number of flagged cells matches the number of mines.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            RevealResult: Summary of the cells and subgrids that changed
+        """
+        result: RevealResult = RevealResult()
+        if self.game_over:
+            return result
+        cell: Cell | None = self.global_to_cell(gx, gy)
+        if not cell or not cell.uncovered:
+            return result
+        flags, mines = self.count_adjacent_flags_mines(gx, gy)
+        if not flags or flags != mines:
+            return result
+
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                result.merge(self.reveal_cell(gx + dx, gy + dy))
+        return result
+
+    def mark(self, gx: int, gy: int) -> bool:
+        """
+        Toggle the mark (flag) on the covered cell at (gx, gy).
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            bool: True if the mark changed
+        """
+        cell: Cell | None = self.global_to_cell(gx, gy)
+        if not cell or cell.uncovered:
+            return False
+        cell.marked = not cell.marked
+        return True
+
+    def highlight_neighbors(self, gx: int, gy: int) -> bool:
+        """
+        Highlight the covered neighbors of the uncovered cell at (gx, gy).
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+
+        Returns:
+            bool: True if any neighbors were highlighted
+        """
+        if self.game_over:
+            return False
+        cell: Cell | None = self.global_to_cell(gx, gy)
+        if not cell or not cell.uncovered:
+            return False
+        # if no neighboring mines do not highlight
+        if not self.count_adjacent_mines(gx, gy):
+            return False
+
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                cell = self.global_to_cell(gx + dx, gy + dy)
+                if cell and not cell.uncovered:
+                    cell.highlighted = True
+        return True
+
+    def check_subgrid_solved(self, sg_coord: GridPos) -> bool:
+        """
+        Mark a subgrid as solved if the all cells that dont contain a mine have been uncovered.
+
+        Args:
+            sg_coord (GridPos): The coordinates of the subgrid
+
+        Returns:
+            bool: True if the subgrid became solved by this call
+        """
+        subgrid: SubGrid = self.subgrids[sg_coord]
+        if subgrid.solved or not subgrid.all_safe_uncovered:
+            return False
+        subgrid.solved = True
+        subgrid.touch()
+        self.num_solved += 1
+        self.update_block(sg_coord, 0, 1, 0)
+        subgrid.set_marked(subgrid.mines, True)
+        return True
@@ -11,3 +11,16 @@ class GameDifficulty(StrEnum):
     EASY = "easy"
     MEDIUM = "medium"
     HARD = "hard"
+
+
+class FrontierShape(StrEnum):
+    SQUARE = "square"
+    CIRCLE = "circle"
+    BLOB = "blob"
+
+
+class ZoomLevel(StrEnum):
+    NORMAL = "normal"
+    CELL = "cell"
+    SUBGRID = "subgrid"
+    BLOCK = "block"
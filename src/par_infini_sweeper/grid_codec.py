@@ -0,0 +1,92 @@
+"""Encoding of subgrid state stored in the grids table."""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, NamedTuple
+
+import orjson
+
+GRID_DATA_VERSION: int = 1
+FLAG_SOLVED: int = 1
+FLAG_LAYOUT_MODIFIED: int = 2
+
+# version, mines, marked, uncovered, flags
+_GRID_DATA = struct.Struct("<BQQQB")
+
+
+class GridData(NamedTuple):
+    """Decoded state of a persisted subgrid."""
+
+    mines: int
+    marked: int
+    uncovered: int
+    solved: bool
+    layout_modified: bool
+
+
+def encode_grid_data(data: GridData) -> bytes:
+    """
+    Encode subgrid state into the versioned binary grid_data format.
+
+    Args:
+        data (GridData): Subgrid state to encode.
+
+    Returns:
+        bytes: 26 byte blob.
+    """
+    flags: int = (FLAG_SOLVED if data.solved else 0) | (FLAG_LAYOUT_MODIFIED if data.layout_modified else 0)
+    return _GRID_DATA.pack(GRID_DATA_VERSION, data.mines, data.marked, data.uncovered, flags)
+
+
+def grid_data_from_dict(data: dict[str, Any]) -> GridData:
+    """
+    Decode the JSON dict format used before binary grid_data.
+    Accepts both the bitmask format and the legacy nested list of cell dicts.
+    Subgrids saved before layouts were seeded are treated as having a modified layout.
+
+    Args:
+        data (dict[str, Any]): Parsed JSON grid_data.
+
+    Returns:
+        GridData: Decoded subgrid state.
+    """
+    if "cells" not in data:
+        return GridData(
+            data["mines"],
+            data["marked"],
+            data["uncovered"],
+            data.get("solved", False),
+            data.get("layout_modified", True),
+        )
+    mines: int = 0
+    marked: int = 0
+    uncovered: int = 0
+    for y, row in enumerate(data["cells"]):
+        for x, cell in enumerate(row):
+            bit: int = 1 << ((y << 3) | x)
+            if cell["is_mine"]:
+                mines |= bit
+            if cell["marked"]:
+                marked |= bit
+            if cell["uncovered"]:
+                uncovered |= bit
+    return GridData(mines, marked, uncovered, data.get("solved", False), data.get("layout_modified", True))
+
+
+def decode_grid_data(grid_data: bytes | str) -> GridData:
+    """
+    Decode a grid_data value in either the binary format or legacy JSON.
+
+    Args:
+        grid_data (bytes | str): Value of the grid_data column.
+
+    Returns:
+        GridData: Decoded subgrid state.
+    """
+    if isinstance(grid_data, str):
+        return grid_data_from_dict(orjson.loads(grid_data))
+    version, mines, marked, uncovered, flags = _GRID_DATA.unpack(grid_data)
+    if version != GRID_DATA_VERSION:
+        raise ValueError(f"Unsupported grid_data version {version}")
+    return GridData(mines, marked, uncovered, bool(flags & FLAG_SOLVED), bool(flags & FLAG_LAYOUT_MODIFIED))
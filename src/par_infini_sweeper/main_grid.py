@@ -1,16 +1,64 @@
 from __future__ import annotations
 
-from rich.text import Text
+from collections.abc import Callable, Container
+
+from rich.segment import Segment
+from rich.style import Style
 from textual import work
 from textual.binding import Binding
 from textual.events import MouseDown, MouseEvent, MouseMove, MouseUp
 from textual.geometry import Offset
+from textual.strip import Strip
+from textual.timer import Timer
 from textual.widget import Widget
 from textual.widgets import Static
 
-from par_infini_sweeper.data_structures import GameState, GridPos, SubGrid
+from par_infini_sweeper.data_structures import (
+    CELLS_PER_CHAR,
+    ZOOM_LEVELS,
+    CellGlyph,
+    GameState,
+    GridPos,
+    RevealResult,
+    SubGrid,
+)
 from par_infini_sweeper.dialogs.highscore_dialog import HighscoreDialog
 from par_infini_sweeper.dialogs.information import InformationDialog
+from par_infini_sweeper.enums import ZoomLevel
+from par_infini_sweeper.minimap import Minimap
+from par_infini_sweeper.row_cache import ROW_CACHE_SIZE, RowCache, SubGridRows
+from par_infini_sweeper.save_queue import SaveError
+
+# Cells rendered beyond each side of the view, and rows kept above and below it, so short pans reuse earlier frames
+PAN_MARGIN: int = 16
+
+
+def merge_segments(segments: list[Segment]) -> list[Segment]:
+    """
+    Join runs of adjacent segments that share a style into single segments.
+    Styles are compared by identity, which is enough for the interned cell styles.
+
+    Args:
+        segments (list[Segment]): The segments to merge
+
+    Returns:
+        list[Segment]: The merged segments
+    """
+    merged: list[Segment] = []
+    # First segment of the current run, reused as is when the run has only one segment
+    first: Segment | None = None
+    text: str = ""
+    for segment in segments:
+        if first is not None:
+            if segment.style is first.style:
+                text += segment.text
+                continue
+            merged.append(first if text is first.text else Segment(text, first.style))
+        first = segment
+        text = segment.text
+    if first is not None:
+        merged.append(first if text is first.text else Segment(text, first.style))
+    return merged
 
 
 class MainGrid(Widget, can_focus=True):
@@ -20,30 +68,61 @@ class MainGrid(Widget, can_focus=True):
         Binding(key="o", action="origin", description="Origin"),
         Binding(key="c", action="center", description="Center", show=False),
         Binding(key="d", action="debug", description="Debug", show=False),
+        Binding(key="m", action="minimap", description="Minimap"),
+        Binding(key="f", action="frontier", description="Frontier", show=False),
         Binding(key="p", action="pause", description="Pause"),
         Binding(key="s", action="subgrid_highlight", description="Subgrid Highlight"),
         Binding(key="ctrl+d", action="xray", description="X-Ray", show=False),
+        Binding(key="minus", action="zoom(1)", description="Zoom Out"),
+        Binding(key="plus,equals_sign", action="zoom(-1)", description="Zoom In"),
     ]
     ALLOW_SELECT = False
 
-    def __init__(self, game_state: GameState, info_bar: Static, debug_panel: Static) -> None:
+    def __init__(self, game_state: GameState, info_bar: Static, debug_panel: Static, minimap: Minimap) -> None:
         super().__init__()
         game_state.parent = self
         self.info_bar = info_bar
         self.debug_panel = debug_panel
+        self.minimap = minimap
+        self.minimap.main_grid = self
         self.game_state: GameState = game_state
         self.drag_start: GridPos | None = None
         self.drag_threshold: int = 2  # minimal cells to distinguish a drag from a click
         self.is_dragging: bool = False
         self.debug = False
         self.debug_panel.display = self.debug
+        self.minimap.display = False
         self.mouse_sg: SubGrid | None = None
+        self.load_timer: Timer | None = None
+        # Interned styles keyed by (fg, bg) and the segment for each distinct cell glyph in the current theme,
+        # so rendering never parses markup or builds styles and cells with the same colors share one Style
+        self.cell_styles: dict[tuple[str, str], Style] = {}
+        self._segments: dict[CellGlyph, Segment] = {}
+        # Zoom level the segments were made for, cells are one character wide when zoomed out
+        self.frame_zoom: ZoomLevel = ZoomLevel.NORMAL
+        self.row_cache: RowCache = RowCache()
+        # Theme the current frame is rendered with, part of each row cache key
+        self.frame_theme: str = ""
+        # Rendered rows of recent frames by global y, with the global x of their first cell.
+        # They are valid while frame_key, the board version and view options, is unchanged.
+        self.frame_rows: dict[int, tuple[int, list[Segment]]] = {}
+        self.frame_key: tuple[object, ...] = ()
 
     def on_mount(self) -> None:
         if self.game_state.offset.is_origin:
             self.call_after_refresh(self.action_center)
         self.update_info()
         self.set_interval(1, self.update_info)
+        if self.game_state.is_loading:
+            self.load_timer = self.set_interval(0.1, self.drain_loaded)
+
+    def drain_loaded(self) -> None:
+        """Add subgrids decoded in the background to the board."""
+        if self.game_state.drain_loaded():
+            self.refresh()
+        if not self.game_state.is_loading and self.load_timer:
+            self.load_timer.stop()
+            self.load_timer = None
 
     def update_info(self) -> None:
         """Update the info bar with the current game state."""
@@ -67,43 +146,325 @@ class MainGrid(Widget, can_focus=True):
                 [
                     f"NumHighlighted: {len(self.game_state.highlighted_cells)}",
                     f"NumSaved: {self.game_state.num_grids_saved}",
+                    f"NumPending: {len(self.game_state.pending_subgrids)}",
+                    f"RowCache: {len(self.row_cache)} ({self.row_cache.hits} hits, {self.row_cache.misses} misses)",
+                    f"SaveQueue: {self.game_state.save_queue.queue_depth}",
+                    f"CommitMs: {self.game_state.save_queue.last_commit_ms:.2f}",
+                    f"Stmts/Save: {self.game_state.save_queue.statements_per_save:.2f}",
                     f"BoardOffset: {self.game_state.offset}",
-                    f"BoardCenter: {self.game_state.compute_board_center()}",
+                    f"Zoom: {self.game_state.zoom}",
+                    f"BoardCenter: {self.game_state.board_center}",
+                    f"BoardBounds: {self.game_state.bounds}",
                 ]
             )
         )
 
-    def render(self) -> Text:
-        """Render the visible portion of the grid as text. Each cell is represented by two characters."""
-        cells_x: int = self.size.width // 2  # each cell is 2 characters wide
-        cells_y: int = self.size.height
-        lines = [
-            "".join(
-                self.game_state.get_cell_representation(col + self.game_state.offset.x, row + self.game_state.offset.y)
-                for col in range(cells_x)
+    def on_resize(self) -> None:
+        # Keep every visible subgrid cached with room for those just off screen
+        visible: int = (self.size.width // 16 + 2 + PAN_MARGIN // 4) * (self.size.height // 8 + 2 + PAN_MARGIN // 4)
+        self.row_cache.capacity = max(ROW_CACHE_SIZE, visible * 2)
+
+    def cell_style(self, fg: str, bg: str) -> Style:
+        """
+        Return the interned style for a cell drawn with the given colors.
+
+        Args:
+            fg (str): The foreground color
+            bg (str): The background color
+
+        Returns:
+            Style: The style shared by every cell with these colors in the current theme
+        """
+        style: Style | None = self.cell_styles.get((fg, bg))
+        if style is None:
+            style = self.cell_styles[(fg, bg)] = Style(color=fg, bgcolor=bg)
+        return style
+
+    def glyph_segment(self, glyph: CellGlyph) -> Segment:
+        """
+        Return the segment that draws a glyph at the current zoom level.
+
+        Args:
+            glyph (CellGlyph): The text, foreground color and background color
+
+        Returns:
+            Segment: The shared segment for the glyph
+        """
+        segment: Segment | None = self._segments.get(glyph)
+        if segment is None:
+            text: str = glyph[0]
+            if self.frame_zoom != ZoomLevel.NORMAL:
+                text = "*" if text == "💣" else text[:1]
+            segment = self._segments[glyph] = Segment(text, self.cell_style(glyph[1], glyph[2]))
+        return segment
+
+    def render_cells(self, gx: int, gy: int, num_cells: int) -> list[Segment]:
+        """
+        Render a run of cells on one row without using the row cache.
+
+        Args:
+            gx (int): The global x-coordinate of the first cell
+            gy (int): The global y-coordinate of the row
+            num_cells (int): The number of cells to render
+
+        Returns:
+            list[Segment]: One segment per cell
+        """
+        get_cell_glyph = self.game_state.get_cell_glyph
+        segments: dict[CellGlyph, Segment] = self._segments
+        row: list[Segment] = []
+        for x in range(gx, gx + num_cells):
+            glyph: CellGlyph = get_cell_glyph(x, gy)
+            row.append(segments.get(glyph) or self.glyph_segment(glyph))
+        return row
+
+    def subgrid_row(self, sg_coord: GridPos, ly: int) -> list[Segment]:
+        """
+        Return the rendered cells of one row of a subgrid, from the row cache when they are up to date.
+
+        Args:
+            sg_coord (GridPos): The coordinates of the subgrid
+            ly (int): The local row within the subgrid
+
+        Returns:
+            list[Segment]: The 8 cell segments of the row
+        """
+        state: GameState = self.game_state
+        sx, sy = sg_coord
+        subgrid: SubGrid | None = state.get_subgrid(sg_coord)
+        hover: bool = state.highlighted_subgrid and state.mouse_sg_coord == sg_coord
+        key: tuple[object, ...]
+        if subgrid is None:
+            # Placeholder rows for a subgrid that has not been generated or loaded yet
+            key = (None, hover, self.frame_theme, self.frame_zoom)
+        else:
+            key = (
+                subgrid,
+                subgrid.version,
+                subgrid.highlighted,
+                subgrid.solved,
+                hover,
+                state.xray,
+                self.frame_theme,
+                self.frame_zoom,
             )
-            for row in range(cells_y)
-        ]
-        return Text.from_markup("\n".join(lines))
+        rows: SubGridRows | None = self.row_cache.get(sg_coord, key)
+        if rows is None:
+            rows = [self.render_cells(sx * 8, sy * 8 + y, 8) for y in range(8)]
+            if subgrid is not None:
+                # Rendering may fault in neighbors whose mine counts change this subgrid
+                key = (subgrid, subgrid.version, *key[2:])
+            self.row_cache.put(sg_coord, key, rows)
+        return rows[ly]
+
+    def render_span(self, gx: int, gy: int, num_cells: int) -> list[Segment]:
+        """
+        Render a run of cells on one row from the cached subgrid rows.
+
+        Args:
+            gx (int): The global x-coordinate of the first cell
+            gy (int): The global y-coordinate of the row
+            num_cells (int): The number of cells to render
+
+        Returns:
+            list[Segment]: One segment per cell
+        """
+        sy, ly = gy >> 3, gy & 7
+        end_x: int = gx + num_cells
+        span: list[Segment] = []
+        for sx in range(gx >> 3, ((end_x - 1) >> 3) + 1):
+            row: list[Segment] = self.subgrid_row((sx, sy), ly)
+            start: int = max(gx - sx * 8, 0)
+            end: int = min(end_x - sx * 8, 8)
+            span.extend(row if start == 0 and end == 8 else row[start:end])
+        return span
+
+    def render_overview_span(self, ux: int, uy: int, num_units: int) -> list[Segment]:
+        """
+        Render a run of subgrids or blocks on one row of the overview zoom levels from their summaries.
+
+        Args:
+            ux (int): The x-coordinate of the first subgrid or block
+            uy (int): The y-coordinate of the row of subgrids or blocks
+            num_units (int): The number of subgrids or blocks to render
+
+        Returns:
+            list[Segment]: One segment per subgrid or block
+        """
+        state: GameState = self.game_state
+        get_glyph: Callable[[int, int], CellGlyph]
+        summaries: Container[GridPos]
+        pending: Container[GridPos]
+        if state.zoom == ZoomLevel.SUBGRID:
+            get_glyph, summaries, pending = state.get_subgrid_glyph, state.subgrids, state.pending_subgrids
+        else:
+            get_glyph, summaries, pending = state.get_block_glyph, state.blocks, ()
+        segments: dict[CellGlyph, Segment] = self._segments
+        # Segments for unexplored space on each color of the checker pattern, most of a zoomed out view
+        empty: list[Segment | None] = [None, None]
+        span: list[Segment] = []
+        for x in range(ux, ux + num_units):
+            pos: GridPos = (x, uy)
+            if pos not in summaries and pos not in pending:
+                segment: Segment | None = empty[(x + uy) & 1]
+                if segment is None:
+                    segment = empty[(x + uy) & 1] = self.glyph_segment(get_glyph(x, uy))
+                span.append(segment)
+                continue
+            glyph: CellGlyph = get_glyph(x, uy)
+            span.append(segments.get(glyph) or self.glyph_segment(glyph))
+        return span
+
+    def render_line(self, y: int) -> Strip:
+        """
+        Render one row of the visible grid. Each cell is represented by two characters, or one in the cell zoom level.
+
+        Rows are kept between frames with PAN_MARGIN extra cells on each side, so while the board is unchanged
+        a pan only renders the cells it exposes and the rest of each line is sliced from the previous frame.
+        """
+        state: GameState = self.game_state
+        if self.app.theme != self.frame_theme or state.zoom != self.frame_zoom:
+            self.frame_theme = self.app.theme
+            self.frame_zoom = state.zoom
+            self.cell_styles.clear()
+            self._segments.clear()
+        # In the overview zoom levels the "cells" below are subgrids or blocks
+        render_span: Callable[[int, int, int], list[Segment]] = self.render_span
+        if state.zoom in (ZoomLevel.SUBGRID, ZoomLevel.BLOCK):
+            render_span = self.render_overview_span
+        cell_width: int = 2 if state.zoom == ZoomLevel.NORMAL else 1
+        scale: int = CELLS_PER_CHAR[state.zoom]
+        width: int = self.size.width
+        num_cells: int = width // cell_width
+        x0: int = state.offset.x // scale
+        y0: int = state.offset.y // scale
+        gy: int = y0 + y
+        frame_key: tuple[object, ...] = (
+            state.version,
+            state.xray,
+            state.highlighted_subgrid and state.mouse_sg_coord,
+            self.frame_theme,
+            self.frame_zoom,
+        )
+        if frame_key != self.frame_key:
+            self.frame_rows.clear()
+            self.frame_key = frame_key
+
+        cached: tuple[int, list[Segment]] | None = self.frame_rows.get(gy)
+        if cached is None or x0 >= cached[0] + len(cached[1]) or x0 + num_cells <= cached[0]:
+            row_start: int = x0 - PAN_MARGIN
+            row: list[Segment] = render_span(row_start, gy, num_cells + PAN_MARGIN * 2)
+            self.frame_rows[gy] = (row_start, row)
+        else:
+            row_start, row = cached
+            row_end: int = row_start + len(row)
+            if x0 < row_start or x0 + num_cells > row_end:
+                if x0 < row_start:
+                    row = render_span(x0 - PAN_MARGIN, gy, row_start - x0 + PAN_MARGIN) + row
+                    row_start = x0 - PAN_MARGIN
+                if x0 + num_cells > row_end:
+                    row = row + render_span(row_end, gy, x0 + num_cells + PAN_MARGIN - row_end)
+                # Drop cells that have scrolled well out of view
+                trim: int = max(x0 - PAN_MARGIN * 2 - row_start, 0)
+                row = row[trim : x0 - row_start + num_cells + PAN_MARGIN * 2]
+                row_start += trim
+                self.frame_rows[gy] = (row_start, row)
+        if len(self.frame_rows) > self.size.height + PAN_MARGIN * 4:
+            top: int = y0 - PAN_MARGIN
+            bottom: int = y0 + self.size.height + PAN_MARGIN
+            self.frame_rows = {ry: entry for ry, entry in self.frame_rows.items() if top <= ry < bottom}
+
+        start: int = x0 - row_start
+        strip: list[Segment] = merge_segments(row[start : start + num_cells])
+        if width % cell_width:
+            strip.append(Segment(" ", self.rich_style))
+        return Strip(strip, width)
+
+    def view_cells(self) -> GridPos:
+        """Return the number of cells across and down the view at the current zoom level."""
+        zoom: ZoomLevel = self.game_state.zoom
+        scale: int = CELLS_PER_CHAR[zoom]
+        cell_width: int = 2 if zoom == ZoomLevel.NORMAL else 1
+        return self.size.width // cell_width * scale, self.size.height * scale
+
+    def center_on(self, gx: int, gy: int) -> None:
+        """
+        Move the view so the cell at global coordinates (gx, gy) is in the middle of it.
+
+        Args:
+            gx (int): The global x-coordinate of the cell
+            gy (int): The global y-coordinate of the cell
+        """
+        width, height = self.view_cells()
+        self.game_state.offset = Offset(gx - width // 2, gy - height // 2)
+        self.game_state.save()
+        self.refresh()
 
     def action_center(self) -> None:
         """Center view on center of board"""
-        c = self.game_state.compute_board_center()
+        c = self.game_state.board_center
+        if self.game_state.zoom != ZoomLevel.NORMAL:
+            self.center_on(c.x, c.y)
+            return
         self.game_state.offset = Offset(-self.size.width // 4 + c.x, -self.size.height // 4 + c.y)
         self.game_state.save()
         self.refresh()
 
     def action_origin(self) -> None:
         """Center view on center of first subgrid"""
+        if self.game_state.zoom != ZoomLevel.NORMAL:
+            self.center_on(4, 4)
+            return
         self.game_state.offset = Offset(-self.size.width // 4 + 5, -self.size.height // 4 - 3)
         self.game_state.save()
         self.refresh()
 
+    def action_frontier(self) -> None:
+        """Center view on the covered cell next to uncovered ones that is closest to the middle of the view"""
+        width, height = self.view_cells()
+        target: GridPos | None = self.game_state.nearest_frontier(
+            self.game_state.offset.x + width // 2, self.game_state.offset.y + height // 2
+        )
+        if target is None:
+            self.notify("No cells left to uncover next to uncovered cells")
+            return
+        self.center_on(*target)
+
+    def action_zoom(self, step: int) -> None:
+        """
+        Zoom out (positive step) or in (negative step) keeping the middle of the view in place.
+
+        Args:
+            step (int): Number of zoom levels to move by
+        """
+        index: int = ZOOM_LEVELS.index(self.game_state.zoom) + step
+        if not 0 <= index < len(ZOOM_LEVELS):
+            return
+        self.zoom_to(ZOOM_LEVELS[index])
+
+    def zoom_to(self, zoom: ZoomLevel, center: GridPos | None = None) -> None:
+        """
+        Switch to a zoom level centered on a cell.
+
+        Args:
+            zoom (ZoomLevel): The zoom level to show
+            center (GridPos | None): Global coordinates of the cell to center on, the middle of the view if None
+        """
+        if center is None:
+            width, height = self.view_cells()
+            center = (self.game_state.offset.x + width // 2, self.game_state.offset.y + height // 2)
+        self.game_state.zoom = zoom
+        self.center_on(*center)
+
     def action_debug(self) -> None:
         """Toggle the debug mode for the game."""
         self.debug = not self.debug
         self.debug_panel.display = self.debug
 
+    def action_minimap(self) -> None:
+        """Toggle the minimap panel."""
+        self.minimap.display = not self.minimap.display
+
     def action_xray(self) -> None:
         """Toggle the x-ray mode for the game."""
         self.game_state.xray = not self.game_state.xray
@@ -112,6 +473,11 @@ class MainGrid(Widget, can_focus=True):
     @work
     async def action_pause(self) -> None:
         self.game_state.paused = True
+        self.game_state.save(snapshot=True)
+        try:
+            self.game_state.flush()
+        except SaveError as e:
+            self.notify(str(e), severity="error")
         await self.app.push_screen_wait(InformationDialog("Paused", "Press ESC to continue"))
         self.game_state.paused = False
 
@@ -126,9 +492,19 @@ class MainGrid(Widget, can_focus=True):
         if self.is_dragging:
             return
         gx, gy = self.game_state.mouse_to_global_grid_coords(event)
+        if self.game_state.zoom in (ZoomLevel.SUBGRID, ZoomLevel.BLOCK):
+            # Clicking the overview zooms back in on the spot clicked
+            if event.button == 1:
+                self.zoom_to(ZoomLevel.NORMAL, (gx, gy))
+            return
         if event.button == 1 and not (event.shift or event.ctrl):
-            self.game_state.reveal_cell(gx, gy)
-            self.game_state.first_click = False
+            first_click: bool = self.game_state.first_click
+            result: RevealResult = self.game_state.reveal(gx, gy)
+            if first_click and result.changed:
+                # The first click may move a mine, changing counts outside the subgrids it touched
+                self.refresh()
+            else:
+                self.game_state.refresh_subgrids(result.subgrids_touched | result.subgrids_created)
         elif event.button == 1 and (event.shift or event.ctrl):
             self.game_state.toggle_mark(gx, gy, True)
 
@@ -178,7 +554,7 @@ class MainGrid(Widget, can_focus=True):
             dy: int = event.y - self.drag_start[1]
             if abs(dx) >= self.drag_threshold or abs(dy) >= self.drag_threshold:
                 # Update the view offset in the opposite direction of the drag.
-                self.game_state.offset -= Offset(dx, dy)
+                self.game_state.offset -= Offset(dx, dy) * CELLS_PER_CHAR[self.game_state.zoom]
                 self.drag_start = (event.x, event.y)
                 self.is_dragging = True
                 self.refresh()
@@ -202,9 +578,10 @@ class MainGrid(Widget, can_focus=True):
             self.handle_click(event)
         self.drag_start = None
         self.is_dragging = False
+        highlighted: list[GridPos] = list(self.game_state.highlighted_cells)
         self.game_state.clear_highlighted()
+        self.game_state.refresh_cells(highlighted)
         self.game_state.save()
-        self.refresh()
         if self.game_state.game_over:
             self.app.push_screen(HighscoreDialog(self.game_state))
 
@@ -214,5 +591,4 @@ class MainGrid(Widget, can_focus=True):
 
     def action_subgrid_highlight(self) -> None:
         self.game_state.highlighted_subgrid = not self.game_state.highlighted_subgrid
-        if not self.game_state.highlighted_subgrid:
-            self.refresh()
+        self.game_state.refresh_subgrids([self.game_state.mouse_sg_coord])
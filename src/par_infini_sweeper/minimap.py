@@ -0,0 +1,172 @@
+"""Minimap panel showing the whole explored board and the area shown by MainGrid."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from rich.segment import Segment
+from rich.style import Style
+from textual.events import Click
+from textual.geometry import Offset, Size
+from textual.strip import Strip
+from textual.widget import Widget
+
+from par_infini_sweeper.data_structures import GameState, GridPos, SubGrid
+from par_infini_sweeper.engine import SummaryRaster
+
+if TYPE_CHECKING:
+    from par_infini_sweeper.main_grid import MainGrid
+
+# Seconds between checks for changes to the board or the view
+MINIMAP_INTERVAL: float = 0.25
+
+# Colors of tiles with no subgrids, with some unsolved subgrids, with only solved subgrids and on the view outline
+EMPTY_COLOR: str = "#1e1e1e"
+EXPLORED_COLOR: str = "#87afd7"
+SOLVED_COLOR: str = "#5f5f5f"
+VIEW_COLOR: str = "#ffff00"
+
+# Each character shows two tiles stacked vertically, the upper one in the foreground
+HALF_BLOCK: str = "▀"
+
+
+class Minimap(Widget):
+    """
+    Overview of the whole explored board with the view of the main grid outlined.
+    Each tile is drawn from the summary rasters the board keeps up to date, picking the finest
+    raster that fits, so drawing it never depends on the number of subgrids.
+    Clicking the minimap centers the main grid on that spot.
+    """
+
+    def __init__(self, game_state: GameState, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.game_state: GameState = game_state
+        # Set by the MainGrid the minimap belongs to
+        self.main_grid: MainGrid | None = None
+        # Subgrids per tile and the tile shown in the top left corner, updated when the frame key changes
+        self.tile: int = 1
+        self.origin: GridPos = (0, 0)
+        self.raster: SummaryRaster | None = None
+        # Tile bounds of the view of the main grid
+        self.view: tuple[int, int, int, int] = (0, 0, 0, 0)
+        self.frame_key: tuple[object, ...] = ()
+        self.styles_cache: dict[tuple[str, str], Style] = {}
+
+    def on_mount(self) -> None:
+        self.set_interval(MINIMAP_INTERVAL, self.check_changed)
+
+    def current_key(self) -> tuple[object, ...]:
+        """Return everything that affects what the minimap shows."""
+        view_size: Size = self.main_grid.size if self.main_grid else Size(0, 0)
+        return self.game_state.version, self.game_state.offset, self.game_state.zoom, view_size, self.size
+
+    def check_changed(self) -> None:
+        """Repaint the minimap if the board or the view changed since it was last drawn."""
+        if self.display and self.current_key() != self.frame_key:
+            self.refresh()
+
+    def view_subgrids(self) -> tuple[int, int, int, int]:
+        """Return the (min x, min y, max x, max y) subgrid coordinates of the view of the main grid."""
+        offset: Offset = self.game_state.offset
+        width, height = self.main_grid.view_cells() if self.main_grid else (1, 1)
+        return offset.x >> 3, offset.y >> 3, (offset.x + max(width, 1) - 1) >> 3, (offset.y + max(height, 1) - 1) >> 3
+
+    def update_frame(self) -> None:
+        """Pick the tile size and position that fits the explored board and the view into the minimap."""
+        self.frame_key = self.current_key()
+        width, height = self.size.width, self.size.height * 2
+        vx0, vy0, vx1, vy1 = self.view_subgrids()
+        rasters: list[SummaryRaster] = self.game_state.rasters
+        bx0, by0, bx1, by1 = self.game_state.bounds
+        x0, y0, x1, y1 = min(bx0, vx0), min(by0, vy0), max(bx1, vx1), max(by1, vy1)
+
+        raster: SummaryRaster | None = None
+        tile: int = 1
+        candidates: list[SummaryRaster | None] = [None, *rasters]
+        for candidate in candidates:
+            tile = candidate.tile if candidate else 1
+            if x1 // tile - x0 // tile < width and y1 // tile - y0 // tile < height:
+                raster = candidate
+                break
+        else:
+            # Too far apart to fit at any size, so keep the view in the middle
+            raster = rasters[-1]
+            tile = raster.tile
+            x0, y0, x1, y1 = vx0, vy0, vx1, vy1
+
+        self.tile = tile
+        self.raster = raster
+        self.origin = (
+            (x0 // tile + x1 // tile) // 2 - (width - 1) // 2,
+            (y0 // tile + y1 // tile) // 2 - (height - 1) // 2,
+        )
+        self.view = (vx0 // tile, vy0 // tile, vx1 // tile, vy1 // tile)
+
+    def tile_color(self, tx: int, ty: int) -> str:
+        """
+        Return the color of a tile of the current frame.
+
+        Args:
+            tx (int): The x-coordinate of the tile
+            ty (int): The y-coordinate of the tile
+
+        Returns:
+            str: The color to draw the tile with
+        """
+        vx0, vy0, vx1, vy1 = self.view
+        if vx0 <= tx <= vx1 and vy0 <= ty <= vy1 and (tx in (vx0, vx1) or ty in (vy0, vy1)):
+            return VIEW_COLOR
+        pos: GridPos = (tx, ty)
+        if self.raster is None:
+            subgrid: SubGrid | None = self.game_state.subgrids.get(pos)
+            if subgrid is None:
+                return EMPTY_COLOR
+            return SOLVED_COLOR if subgrid.solved else EXPLORED_COLOR
+        num_subgrids: int = self.raster.subgrids.get(pos, 0)
+        if not num_subgrids:
+            return EMPTY_COLOR
+        return SOLVED_COLOR if self.raster.solved.get(pos, 0) == num_subgrids else EXPLORED_COLOR
+
+    def render_line(self, y: int) -> Strip:
+        """
+        Render one line of the minimap, two rows of tiles.
+
+        Args:
+            y (int): The line of the widget to render
+
+        Returns:
+            Strip: The rendered line
+        """
+        if self.current_key() != self.frame_key:
+            self.update_frame()
+        tx0, ty0 = self.origin
+        top: int = ty0 + y * 2
+        segments: list[Segment] = []
+        for x in range(self.size.width):
+            colors: tuple[str, str] = (self.tile_color(tx0 + x, top), self.tile_color(tx0 + x, top + 1))
+            style: Style | None = self.styles_cache.get(colors)
+            if style is None:
+                style = self.styles_cache[colors] = Style(color=colors[0], bgcolor=colors[1])
+            if segments and segments[-1].style is style:
+                segments[-1] = Segment(segments[-1].text + HALF_BLOCK, style)
+            else:
+                segments.append(Segment(HALF_BLOCK, style))
+        return Strip(segments, self.size.width)
+
+    def on_click(self, event: Click) -> None:
+        """
+        Center the main grid on the clicked spot.
+
+        Args:
+            event (Click): The click event
+        """
+        offset: Offset | None = event.get_content_offset(self)
+        if offset is None or self.main_grid is None:
+            return
+        tx: int = self.origin[0] + offset.x
+        ty: int = self.origin[1] + offset.y * 2
+        # The middle of the column of the tile, between the two tiles of the character
+        gx: int = tx * self.tile * 8 + self.tile * 4
+        gy: int = (ty + 1) * self.tile * 8
+        self.main_grid.center_on(gx, gy)
+        self.refresh()
@@ -24,6 +24,7 @@ from textual.visual import SupportsVisual, Visual
 from textual.widgets import Footer, Header, Static
 
 from par_infini_sweeper import __application_title__
+from par_infini_sweeper.backup import BackupThread
 from par_infini_sweeper.data_structures import GameState
 from par_infini_sweeper.dialogs.difficulty_dialog import DifficultyDialog
 from par_infini_sweeper.dialogs.help_dialog import HelpDialog
@@ -34,6 +35,8 @@ from par_infini_sweeper.dialogs.url_dialog import UrlDialog
 from par_infini_sweeper.enums import GameDifficulty
 from par_infini_sweeper.main_grid import MainGrid
 from par_infini_sweeper.messages import ShowURL, WebServerStarted, WebServerStopped
+from par_infini_sweeper.minimap import Minimap
+from par_infini_sweeper.save_queue import SaveError
 
 
 class PimApp(App):
@@ -72,8 +75,10 @@ class PimApp(App):
         self.info = Static("Info", id="info")
         self.debug_panel = Static("Debug", id="debug")
         self.game_state = GameState.load(None, user_name, nickname)
-        self.sweeper_widget = MainGrid(self.game_state, self.info, self.debug_panel)
+        self.minimap = Minimap(self.game_state, id="minimap")
+        self.sweeper_widget = MainGrid(self.game_state, self.info, self.debug_panel, self.minimap)
         self._web_server: socketserver.TCPServer | None = None
+        self._backup_thread = BackupThread()
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
@@ -82,11 +87,25 @@ class PimApp(App):
             yield self.info
             with Horizontal():
                 yield self.sweeper_widget
+                yield self.minimap
                 yield self.debug_panel
 
     def on_mount(self) -> None:
         self.theme = self.game_state.theme
         self.sweeper_widget.focus()
+        self._backup_thread.start()
+
+    def on_unmount(self) -> None:
+        from par_infini_sweeper import db
+
+        self._backup_thread.stop()
+        self.game_state.save(snapshot=True)
+        try:
+            self.game_state.close()
+        except SaveError:
+            # Already logged by the save queue, there is nothing left to show it on
+            pass
+        db.close_db_connection()
 
     @work
     async def action_change_theme(self) -> None:
@@ -118,8 +137,14 @@ class PimApp(App):
         difficulty: GameDifficulty | None = await self.push_screen_wait(DifficultyDialog())
         if difficulty is None:
             return
+        previous: GameDifficulty = self.game_state.difficulty
         self.game_state.difficulty = difficulty
-        self.game_state.new_game()
+        try:
+            self.game_state.new_game()
+        except SaveError as e:
+            self.game_state.difficulty = previous
+            self.notify(f"{e}, the current game was kept", severity="error")
+            return
         self.sweeper_widget.action_center()
 
     @on(ShowURL)
@@ -0,0 +1,73 @@
+"""Cache of rendered subgrid rows for MainGrid."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+from rich.segment import Segment
+
+from par_infini_sweeper.engine import GridPos
+
+# Minimum number of subgrids to keep rendered rows for
+ROW_CACHE_SIZE: int = 1024
+
+# The 8 rows of a subgrid, each a list of 8 cell segments
+SubGridRows = list[list[Segment]]
+
+
+class RowCache:
+    """
+    LRU cache of the rendered rows of each subgrid.
+
+    Entries are stored with a key describing everything that affects how the subgrid is drawn.
+    A lookup with a different key is a miss, so a subgrid is re-rendered after it changes without
+    having to track which entries to drop. Subgrids that have not been drawn recently are evicted
+    once more than `capacity` are cached.
+    """
+
+    def __init__(self, capacity: int = ROW_CACHE_SIZE) -> None:
+        self.capacity: int = capacity
+        self._entries: OrderedDict[GridPos, tuple[tuple[Any, ...], SubGridRows]] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, pos: GridPos, key: tuple[Any, ...]) -> SubGridRows | None:
+        """
+        Return the cached rows for the subgrid at pos if they were rendered with the same key.
+
+        Args:
+            pos (GridPos): The coordinates of the subgrid
+            key (tuple[Any, ...]): The state the rows must have been rendered from
+
+        Returns:
+            SubGridRows | None: The cached rows or None if they are missing or stale
+        """
+        entry: tuple[tuple[Any, ...], SubGridRows] | None = self._entries.get(pos)
+        if entry is None or entry[0] != key:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(pos)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, pos: GridPos, key: tuple[Any, ...], rows: SubGridRows) -> None:
+        """
+        Store the rendered rows for the subgrid at pos, evicting the least recently drawn subgrids if needed.
+
+        Args:
+            pos (GridPos): The coordinates of the subgrid
+            key (tuple[Any, ...]): The state the rows were rendered from
+            rows (SubGridRows): The rendered rows
+        """
+        self._entries[pos] = (key, rows)
+        self._entries.move_to_end(pos)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached rows."""
+        self._entries.clear()
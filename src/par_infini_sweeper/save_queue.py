@@ -0,0 +1,309 @@
+"""Write-behind persistence of game state on a background thread."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+
+from par_infini_sweeper import db
+
+# Seconds to wait after a save for more saves to coalesce into the same transaction
+SAVE_WINDOW: float = 0.5
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class SaveError(Exception):
+    """Raised when queued saves could not be committed."""
+
+
+@dataclass
+class FlushRequest:
+    """Request for the writer to commit everything queued before it, set once it has tried."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    # Why the commit failed, None if everything was committed
+    error: BaseException | None = None
+
+
+@dataclass
+class SaveBatch:
+    """
+    Snapshot of the game state to write. Values are copied when the batch is made so it can be
+    committed from another thread while the game keeps changing.
+    """
+
+    user_id: int
+    game_id: int
+    # theme, difficulty
+    prefs: tuple[str, str] | None = None
+    # game_over, board_offset, duration, seed
+    game: tuple[bool, str, int, int] | None = None
+    # sub_grid_id -> (sx, sy, grid_data), None deletes the row
+    grids: dict[str, tuple[int, int, bytes] | None] = field(default_factory=dict)
+    # seq, kind, gx, gy, created_ts
+    moves: list[tuple[int, str, int, int, float]] = field(default_factory=list)
+    # Sequence number of the last move included in grids when they are a snapshot
+    snapshot_seq: int | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.prefs or self.game or self.grids or self.moves) and self.snapshot_seq is None
+
+    def merge(self, other: SaveBatch) -> None:
+        """Fold a newer batch for the same game into this one."""
+        self.prefs = other.prefs or self.prefs
+        self.game = other.game or self.game
+        self.grids.update(other.grids)
+        self.moves.extend(other.moves)
+        if other.snapshot_seq is not None:
+            self.snapshot_seq = other.snapshot_seq
+
+
+class SaveQueue:
+    """
+    Commits SaveBatches from a background writer thread.
+    Batches submitted within `window` seconds of each other are merged and written in a single transaction,
+    so at most that much play is lost if the process dies. Each commit is atomic.
+
+    A batch that fails to commit is kept and retried after another window. Failures are logged and
+    kept in `error` until a commit succeeds, and `flush` and `close` raise SaveError while it is set.
+    """
+
+    def __init__(self, window: float = SAVE_WINDOW) -> None:
+        self.window: float = window
+        self._queue: queue.SimpleQueue[SaveBatch | FlushRequest | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock: threading.Lock = threading.Lock()
+        # Only used by the writer thread
+        self._pending: SaveBatch | None = None
+        self._num_pending: int = 0
+        self._deadline: float = 0
+        self.queue_depth: int = 0
+        self.num_commits: int = 0
+        self.last_commit_ms: float = 0
+        self.max_commit_ms: float = 0
+        self.total_commit_ms: float = 0
+        self.num_saves: int = 0
+        # Saves that had nothing to write and were never queued
+        self.num_skipped: int = 0
+        self.num_statements: int = 0
+        self.last_statements: int = 0
+        # The last commit failure, cleared by the next successful commit
+        self.error: BaseException | None = None
+
+    @property
+    def avg_commit_ms(self) -> float:
+        return self.total_commit_ms / self.num_commits if self.num_commits else 0
+
+    @property
+    def statements_per_save(self) -> float:
+        """Average number of SQL statements executed per save, counting each executemany row."""
+        num_saves: int = self.num_saves + self.num_skipped
+        return self.num_statements / num_saves if num_saves else 0
+
+    def submit(self, batch: SaveBatch) -> None:
+        """Queue a batch for writing, starting the writer thread if needed."""
+        with self._lock:
+            self.queue_depth += 1
+            self.num_saves += 1
+            if self._thread is None:
+                self._start_writer()
+            self._queue.put(batch)
+
+    def flush(self) -> None:
+        """
+        Block until every submitted batch has been committed.
+
+        Raises:
+            SaveError: If the batches could not be committed, they stay queued and are retried
+        """
+        with self._lock:
+            if self._thread is None:
+                if self._pending is None:
+                    self._raise_error()
+                    return
+                # Batches kept after the writer failed are retried by a new one
+                self._start_writer()
+            request: FlushRequest = FlushRequest()
+            self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise SaveError(f"Saving failed: {request.error}") from request.error
+
+    def close(self) -> None:
+        """
+        Commit everything still queued and stop the writer thread.
+
+        Raises:
+            SaveError: If the last batches could not be committed, they are lost
+        """
+        with self._lock:
+            if self._thread is None and self._pending is not None:
+                self._start_writer()
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            thread.join()
+        self._raise_error()
+
+    def _start_writer(self) -> None:
+        """Start the writer thread, called with the lock held."""
+        self._thread = threading.Thread(target=self._run, name="pim-save-writer", daemon=True)
+        self._thread.start()
+
+    def _raise_error(self) -> None:
+        """Raise SaveError if there are saves that could not be committed."""
+        if self.error is not None:
+            raise SaveError(f"Saving failed: {self.error}") from self.error
+
+    def _run(self) -> None:
+        # The flush or close being handled, released with the error if the writer fails
+        request: FlushRequest | None = None
+        try:
+            while True:
+                timeout: float | None = max(0.0, self._deadline - time.monotonic()) if self._pending else None
+                try:
+                    item: SaveBatch | FlushRequest | None = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    self._commit_pending()
+                    continue
+                if isinstance(item, SaveBatch):
+                    self._add_pending(item)
+                    continue
+                request = item
+                committed: bool = self._commit_pending()
+                if item is None:
+                    if not committed:
+                        logger.error("Dropped %d unsaved saves when closing the save queue", self._num_pending)
+                    return
+                item.error = None if committed else self.error
+                item.done.set()
+                request = None
+        except Exception as e:
+            logger.exception("Save writer stopped unexpectedly")
+            self._stop_with_error(e, request)
+        finally:
+            db.close_db_connection()
+
+    def _add_pending(self, batch: SaveBatch) -> None:
+        """Merge a submitted batch into the one waiting to be committed."""
+        if self._pending is None:
+            self._pending = batch
+            self._deadline = time.monotonic() + self.window
+        else:
+            self._pending.merge(batch)
+        self._num_pending += 1
+
+    def _stop_with_error(self, error: BaseException, request: FlushRequest | None) -> None:
+        """
+        Release everyone waiting on the writer after it failed. Queued batches are kept, so the
+        next save or flush starts a new writer that commits them.
+
+        Args:
+            error (BaseException): Why the writer failed
+            request (FlushRequest | None): The flush that was being handled when it failed
+        """
+        with self._lock:
+            self.error = error
+            if self._thread is threading.current_thread():
+                self._thread = None
+        if request is not None:
+            request.error = error
+            request.done.set()
+        while True:
+            try:
+                item: SaveBatch | FlushRequest | None = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, SaveBatch):
+                self._add_pending(item)
+            elif item is not None:
+                item.error = error
+                item.done.set()
+
+    def _commit_pending(self) -> bool:
+        """Commit the pending batch, returning False if it failed and is kept to retry."""
+        if self._pending is None:
+            return True
+        try:
+            self._commit(self._pending)
+        except sqlite3.Error as e:
+            # Keep the batch and try again after another window, the database is unchanged.
+            logger.warning("Committing %d saves failed, retrying in %.1fs: %s", self._num_pending, self.window, e)
+            self.error = e
+            self._deadline = time.monotonic() + self.window
+            return False
+        with self._lock:
+            self.queue_depth -= self._num_pending
+        self._pending = None
+        self._num_pending = 0
+        self.error = None
+        return True
+
+    def _commit(self, batch: SaveBatch) -> None:
+        start: float = time.perf_counter()
+        num_statements: int = 0
+        conn: sqlite3.Connection = db.get_db_connection()
+        with conn:
+            cursor = conn.cursor()
+            if batch.prefs:
+                cursor.execute(
+                    """UPDATE user_prefs SET theme = ?, difficulty = ? WHERE id = ?""", (*batch.prefs, batch.user_id)
+                )
+                num_statements += 1
+            if batch.game:
+                cursor.execute(
+                    """UPDATE games SET game_over = ?, board_offset = ?, duration = ?, seed = ? WHERE user_id = ?""",
+                    (*batch.game, batch.user_id),
+                )
+                num_statements += 1
+            # Moves up to the snapshot are already in the grids written with it, so they are never logged
+            moves: list[tuple[int, str, int, int, float]] = batch.moves
+            if batch.snapshot_seq is not None:
+                moves = [move for move in moves if move[0] > batch.snapshot_seq]
+            if moves:
+                cursor.executemany(
+                    """INSERT INTO moves (game_id, user_id, seq, kind, gx, gy, created_ts) VALUES (?,?,?,?,?,?,?)""",
+                    [(batch.game_id, batch.user_id, *move) for move in moves],
+                )
+                num_statements += len(moves)
+            if batch.snapshot_seq is not None:
+                cursor.execute(
+                    """UPDATE games SET snapshot_seq = ? WHERE user_id = ?""", (batch.snapshot_seq, batch.user_id)
+                )
+                # Compact the log, the moves folded into the snapshot no longer need replaying
+                cursor.execute(
+                    """DELETE FROM moves WHERE game_id = ? AND user_id = ? AND seq <= ?""",
+                    (batch.game_id, batch.user_id, batch.snapshot_seq),
+                )
+                num_statements += 2
+            deletes: list[tuple[int, int, str]] = []
+            upserts: list[tuple[int, int, str, bytes, int, int]] = []
+            for sub_grid_id, row in batch.grids.items():
+                if row is None:
+                    deletes.append((batch.game_id, batch.user_id, sub_grid_id))
+                else:
+                    upserts.append((batch.game_id, batch.user_id, sub_grid_id, row[2], row[0], row[1]))
+            if deletes:
+                cursor.executemany(
+                    """DELETE FROM grids WHERE game_id = ? AND user_id = ? AND sub_grid_id = ?""", deletes
+                )
+            if upserts:
+                cursor.executemany(
+                    """INSERT OR REPLACE INTO grids (game_id, user_id, sub_grid_id, grid_data, sx, sy) VALUES (?,?,?,?,?,?)""",
+                    upserts,
+                )
+            num_statements += len(deletes) + len(upserts)
+        elapsed: float = (time.perf_counter() - start) * 1000
+        self.num_commits += 1
+        self.last_commit_ms = elapsed
+        self.max_commit_ms = max(self.max_commit_ms, elapsed)
+        self.total_commit_ms += elapsed
+        self.num_statements += num_statements
+        self.last_statements = num_statements